@@ -1,5 +1,202 @@
+import argparse
+import codecs
+import functools
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import mmap
+import os
+import sqlite3
 import string
-from collections import Counter
+import sys
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Built once: deletes ASCII punctuation in the single translate pass each tokenization makes
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+SENTENCE_TERMINATORS = '.!?'
+# Words tracked by the approximate most-common-words sketch
+DEFAULT_SKETCH_CAPACITY = 1000
+# Code points str.split() treats as whitespace; the highest is U+3000
+WHITESPACE_CODE_POINTS = [c for c in range(0x3001) if chr(c).isspace()]
+# Character classes used by analyze_arrays, as a bytes.translate table for ASCII input
+WORD, WHITESPACE, PUNCTUATION, TERMINATOR = range(4)
+CHARACTER_CLASSES = bytes(
+    TERMINATOR if chr(c) in SENTENCE_TERMINATORS else PUNCTUATION if chr(c) in string.punctuation
+    else WHITESPACE if chr(c).isspace() else WORD for c in range(256))
+
+
+def tokenize(text):
+    """
+    Splits a text into lowercase words with punctuation removed.
+
+    Parameters:
+    text (str): The text to tokenize.
+
+    Returns:
+    list: The words of the text, in order.
+    """
+    return text.translate(PUNCTUATION_TABLE).lower().split()
+
+
+def analyze(text, n=3):
+    """
+    Computes every text metric from a single tokenization of the text.
+
+    Parameters:
+    text (str): The text to analyze.
+    n (int): The number of most common words to return. Defaults to 3.
+
+    Returns:
+    dict: word_count, sentence_count, average_sentence_length and most_common_words,
+    equal to the results of the individual functions.
+    """
+    words = tokenize(text)
+    return summarize(len(words), count_sentences(text), Counter(words), n)
+
+
+def summarize(word_count, sentence_count, word_counts, n=3):
+    """
+    Builds the analyze() result from word and sentence totals and a word Counter.
+
+    Parameters:
+    word_count (int): The number of words.
+    sentence_count (int): The number of sentence-ending punctuation marks.
+    word_counts (Counter): Occurrences of each word, in order of first occurrence.
+    n (int): The number of most common words to return. Defaults to 3.
+
+    Returns:
+    dict: word_count, sentence_count, average_sentence_length and most_common_words.
+    """
+    return {
+        'word_count': word_count,
+        'sentence_count': sentence_count,
+        'average_sentence_length': word_count / sentence_count if sentence_count > 0 else 0,
+        'most_common_words': word_counts.most_common(n),
+    }
+
+
+class StreamAnalyzer:
+    """
+    Accumulates text metrics over a text delivered in chunks.
+
+    Chunks may be str or bytes (decoded incrementally, so multi-byte characters can be
+    split between chunks). The trailing partial word of each chunk is held back until
+    the next whitespace arrives, so words split across chunk boundaries are counted once.
+    Memory is bounded by the vocabulary and the longest word, not by the text length.
+    """
+
+    def __init__(self, encoding='utf-8', errors='strict', word_counts=None):
+        self.decoder = codecs.getincrementaldecoder(encoding)(errors)
+        self.pending = ''
+        self.word_count = 0
+        self.sentence_count = 0
+        # A HeavyHitters sketch may replace the exact Counter to bound memory by vocabulary too
+        self.word_counts = Counter() if word_counts is None else word_counts
+
+    def feed(self, chunk):
+        """
+        Adds the next chunk of text.
+
+        Parameters:
+        chunk (str or bytes): The next piece of the text.
+        """
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = self.decoder.decode(chunk)
+        self.sentence_count += count_sentences(chunk)
+        text = self.pending + chunk
+        # Everything after the last whitespace may continue in the next chunk
+        if text and not text[-1].isspace():
+            parts = text.rsplit(None, 1)
+            self.pending = parts[-1]
+            text = parts[0] if len(parts) == 2 else ''
+        else:
+            self.pending = ''
+        self.add_words(tokenize(text))
+
+    def add_words(self, words):
+        self.word_count += len(words)
+        self.word_counts.update(words)
+
+    def result(self, n=3):
+        """
+        Returns the metrics for all text fed so far, treating it as complete.
+
+        Parameters:
+        n (int): The number of most common words to return. Defaults to 3.
+
+        Returns:
+        dict: The same metrics analyze() returns for the concatenated text.
+        """
+        tail = self.decoder.decode(b'', final=True)
+        if tail:
+            self.feed(tail)
+        self.add_words(tokenize(self.pending))
+        self.pending = ''
+        return summarize(self.word_count, self.sentence_count, self.word_counts, n)
+
+
+def read_chunks(path, chunk_size=1 << 20):
+    """
+    Yields a file's contents as bytes chunks, memory-mapping it when possible.
+
+    Parameters:
+    path (str): Path of the file to read.
+    chunk_size (int): Bytes per chunk. Defaults to 1 MiB.
+
+    Returns:
+    iterator: bytes chunks of at most chunk_size bytes.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files, pipes and other unmappable files are read normally
+            mapped = None
+        if mapped is None:
+            yield from iter(functools.partial(f.read, chunk_size), b'')
+            return
+        with mapped:
+            for start in range(0, len(mapped), chunk_size):
+                yield mapped[start:start + chunk_size]
+
+
+def analyze_stream(source, n=3, chunk_size=1 << 20, encoding='utf-8', approximate=False,
+                   capacity=DEFAULT_SKETCH_CAPACITY):
+    """
+    Computes every text metric over a file or an iterable of chunks without loading it whole.
+
+    Parameters:
+    source (str, os.PathLike or iterable): A file path, or an iterable of str/bytes chunks.
+    A plain str is treated as a path; wrap in-memory text in a list to analyze it directly.
+    n (int): The number of most common words to return. Defaults to 3.
+    chunk_size (int): Bytes per chunk when reading a file. Defaults to 1 MiB.
+    encoding (str): Encoding of bytes chunks and files. Defaults to UTF-8.
+    approximate (bool): Find the most common words with a fixed-size HeavyHitters sketch.
+    Defaults to False.
+    capacity (int): Number of words the approximate sketch tracks.
+
+    Returns:
+    dict: The same metrics analyze() returns for the whole text; with approximate, the
+    most common word counts are estimated upper bounds.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = read_chunks(source, chunk_size)
+    analyzer = StreamAnalyzer(encoding, word_counts=HeavyHitters(capacity) if approximate else None)
+    for chunk in source:
+        analyzer.feed(chunk)
+    return analyzer.result(n)
+
 
 def count_words(text):
     """
@@ -11,15 +208,8 @@ def count_words(text):
     Returns:
     int: The number of words in the text.
     """
-    # Remove punctuation and convert to lowercase
-    text = text.translate(str.maketrans('', '', string.punctuation))
-    text = text.lower()
-
-    # Split into words and count them
-    words = text.split()
-    word_count = len(words)
-
-    return word_count
+    # Remove punctuation, convert to lowercase and split into words
+    return len(tokenize(text))
 
 
 def count_sentences(text):
@@ -33,9 +223,7 @@ def count_sentences(text):
     int: The number of sentences in the text.
     """
     # Count the number of sentence-ending punctuation marks
-    sentence_count = text.count('.') + text.count('!') + text.count('?')
-
-    return sentence_count
+    return sum(text.count(terminator) for terminator in SENTENCE_TERMINATORS)
 
 
 def average_sentence_length(text):
@@ -61,63 +249,672 @@ def average_sentence_length(text):
     return average_sentence_length
 
 
-def most_common_words(text, n=3):
+def most_common_words(text, n=3, approximate=False, capacity=DEFAULT_SKETCH_CAPACITY):
     """
     Finds the most common words in a given text.
     Parameters:
     text (str): The text to analyze.
     n (int): The number of most common words to return. Defaults to 3.
+    approximate (bool): Count with a fixed-size HeavyHitters sketch instead of an exact Counter.
+    Defaults to False.
+    capacity (int): Number of words the approximate sketch tracks.
+    Returns:
+    list: A list of tuples containing the most common words and their counts
+    (estimated upper bounds when approximate).
+    """
+    # Count the words and get the most common ones with their counts
+    if approximate:
+        word_counts = HeavyHitters(capacity)
+        word_counts.update(tokenize(text))
+        return word_counts.most_common(n)
+    return Counter(tokenize(text)).most_common(n)
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitters summary: tracks at most capacity words in fixed memory.
+
+    When a new word arrives and all counters are taken, the word with the smallest count is
+    replaced and the new word inherits that count as its error. Every reported count is an
+    overestimate by at most its error, and every error is at most total / capacity, so any
+    word occurring more than total / capacity times is guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1.')
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        # One (count, word) entry per tracked word; counts only grow, so entries may be stale
+        # and are refreshed when they reach the top
+        self.heap = []
+
+    def add(self, word, weight=1):
+        """
+        Counts weight more occurrences of word.
+
+        Parameters:
+        word (str): The word.
+        weight (int): Number of occurrences. Defaults to 1.
+        """
+        self.total += weight
+        if word in self.counts:
+            self.counts[word] += weight
+        elif len(self.counts) < self.capacity:
+            self.counts[word] = weight
+            self.errors[word] = 0
+            heapq.heappush(self.heap, (weight, word))
+        else:
+            minimum = self.pop_minimum()
+            self.counts[word] = minimum + weight
+            self.errors[word] = minimum
+            heapq.heappush(self.heap, (minimum + weight, word))
+
+    def pop_minimum(self):
+        while True:
+            count, word = heapq.heappop(self.heap)
+            if self.counts[word] == count:
+                del self.counts[word]
+                del self.errors[word]
+                return count
+            heapq.heappush(self.heap, (self.counts[word], word))
+
+    def minimum(self):
+        """
+        Returns the count any untracked word may have reached (0 until every counter is used).
+        """
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other):
+        """
+        Merges another summary into this one, keeping this summary's capacity.
+
+        Words missing from one summary are assumed to have that summary's minimum count, which
+        keeps counts as overestimates and error bounds valid for the combined stream.
+
+        Parameters:
+        other (SpaceSaving): A summary of another part of the stream.
+        """
+        own_minimum, other_minimum = self.minimum(), other.minimum()
+        counts, errors = {}, {}
+        for word in itertools.chain(self.counts, (word for word in other.counts if word not in self.counts)):
+            counts[word] = self.counts.get(word, own_minimum) + other.counts.get(word, other_minimum)
+            errors[word] = self.errors.get(word, own_minimum) + other.errors.get(word, other_minimum)
+        kept = heapq.nlargest(self.capacity, counts, key=counts.get)
+        self.counts = {word: counts[word] for word in kept}
+        self.errors = {word: errors[word] for word in kept}
+        self.heap = [(count, word) for word, count in self.counts.items()]
+        heapq.heapify(self.heap)
+        self.total += other.total
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch: a depth x width table of counters giving frequency estimates for any word.
+
+    Estimates never undercount, and overcount by at most e / width * total with probability
+    at least 1 - exp(-depth). Words are hashed with BLAKE2b, so sketches built in different
+    processes with the same dimensions and seed can be merged.
+    """
+
+    def __init__(self, width=2719, depth=5, seed=0):
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.rows = [array('q', bytes(8 * width)) for _ in range(depth)]
+        self.total = 0
+
+    def positions(self, word):
+        digest = hashlib.blake2b(word.encode('utf-8', 'surrogatepass'), digest_size=16,
+                                 salt=self.seed.to_bytes(16, 'little')).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + row * second) % self.width for row in range(self.depth)]
+
+    def add(self, word, weight=1):
+        self.total += weight
+        for row, position in zip(self.rows, self.positions(word)):
+            row[position] += weight
+
+    def estimate(self, word):
+        """
+        Returns an upper bound on the number of occurrences of word.
+        """
+        return min(row[position] for row, position in zip(self.rows, self.positions(word)))
+
+    def error_bound(self):
+        """
+        Returns (overcount, probability): estimates exceed the true count by more than
+        overcount with at most the given probability.
+        """
+        return math.e / self.width * self.total, math.exp(-self.depth)
+
+    def merge(self, other):
+        if (other.width, other.depth, other.seed) != (self.width, self.depth, self.seed):
+            raise ValueError('Count-Min sketches must have the same width, depth and seed to merge.')
+        for row, other_row in zip(self.rows, other.rows):
+            for position, value in enumerate(other_row):
+                if value:
+                    row[position] += value
+        self.total += other.total
+
+
+class HeavyHitters:
+    """
+    Approximate word counts in fixed memory: a Space-Saving summary of the most frequent words,
+    optionally with a Count-Min sketch that tightens their estimated counts.
+
+    Words are counted exactly in batches of batch_size before being added to the sketches, so
+    memory stays bounded by capacity, the Count-Min table and one batch. most_common(n) has the
+    same shape as Counter.most_common(n), so a HeavyHitters can stand in for a Counter.
+    """
+
+    def __init__(self, capacity=DEFAULT_SKETCH_CAPACITY, count_min=None, batch_size=65536):
+        self.space_saving = SpaceSaving(capacity)
+        self.count_min = count_min
+        self.batch_size = batch_size
+
+    def update(self, words):
+        """
+        Counts the given words.
+
+        Parameters:
+        words (list): Words, as returned by tokenize().
+        """
+        for start in range(0, len(words), self.batch_size):
+            self.update_counts(Counter(words[start:start + self.batch_size]))
+
+    def update_counts(self, word_counts):
+        """
+        Adds exact counts, e.g. a Counter for one document.
+
+        Parameters:
+        word_counts (dict): Occurrences of each word.
+        """
+        for word, count in word_counts.items():
+            self.space_saving.add(word, count)
+            if self.count_min is not None:
+                self.count_min.add(word, count)
+
+    def merge(self, other):
+        """
+        Merges the sketches of another HeavyHitters built over a different part of the input.
+
+        Parameters:
+        other (HeavyHitters): Sketches built with the same Count-Min dimensions and seed.
+        """
+        self.space_saving.merge(other.space_saving)
+        if self.count_min is not None and other.count_min is not None:
+            self.count_min.merge(other.count_min)
+        elif self.count_min is not None or other.count_min is not None:
+            raise ValueError('Both sketches must use a Count-Min sketch, or neither.')
+
+    def top(self, n=None):
+        """
+        Returns the most frequent words with their estimated counts and error bounds.
+
+        Parameters:
+        n (int): The number of words to return. Defaults to all tracked words.
+
+        Returns:
+        list: (word, count, error) tuples, most frequent first. The true count of each
+        word lies between count - error and count.
+        """
+        summary = self.space_saving
+        results = []
+        for word, count in summary.counts.items():
+            lower = count - summary.errors[word]
+            if self.count_min is not None:
+                count = min(count, self.count_min.estimate(word))
+            results.append((word, count, count - lower))
+        results.sort(key=lambda result: result[1], reverse=True)
+        return results if n is None else results[:n]
+
+    def most_common(self, n=None):
+        return [(word, count) for word, count, error in self.top(n)]
+
+    def error_bound(self):
+        """
+        Returns the worst-case overestimate of any reported count.
+
+        Returns:
+        dict: total words counted, space_saving (maximum overestimate of a tracked word and the
+        largest count an untracked word can have) and, with a Count-Min sketch, count_min
+        (overestimate bound and the probability of exceeding it).
+        """
+        bounds = {'total': self.space_saving.total, 'space_saving': self.space_saving.minimum()}
+        if self.count_min is not None:
+            bounds['count_min'] = self.count_min.error_bound()
+        return bounds
+
+
+class AnalysisCache:
+    """
+    Content-addressed cache of text analyses.
+
+    Entries are keyed by a BLAKE2b hash of the text and hold its word and sentence totals
+    and its full word count table, so one entry answers every metric and most_common_words
+    for any n. The memory tier is an LRU bounded by the estimated in-memory size of its
+    entries (the ranked list, its tuples, words and counts); with a path, entries are also kept in a SQLite file that survives restarts and is
+    consulted on memory misses.
+    """
+
+    # Bumped when tokenization changes, so entries computed by older versions are not reused
+    VERSION = 1
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, path=None, max_disk_bytes=1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.path = path
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        self.local = threading.local()
+        if path is not None:
+            with self.connection() as connection:
+                connection.execute('CREATE TABLE IF NOT EXISTS analysis_cache '
+                                   '(key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, '
+                                   'used REAL NOT NULL)')
+                connection.execute('CREATE INDEX IF NOT EXISTS analysis_cache_used ON analysis_cache (used)')
+
+    def connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode = WAL')
+            self.local.connection = connection
+        return connection
+
+    def key(self, text):
+        digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+        return f'{self.VERSION}:{digest}'
+
+    def entry(self, text):
+        """
+        Returns (word_count, sentence_count, word counts ranked like Counter.most_common()).
+
+        Parameters:
+        text (str): The text to analyze.
+
+        Returns:
+        tuple: The cached entry, computed and stored on a miss.
+        """
+        key = self.key(text)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[0]
+        if self.path is not None:
+            row = self.connection().execute('SELECT value FROM analysis_cache WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                with self.connection() as connection:
+                    connection.execute('UPDATE analysis_cache SET used = ? WHERE key = ?', (time.time(), key))
+                word_count, sentence_count, ranked = json.loads(row[0])
+                entry = (word_count, sentence_count, [tuple(pair) for pair in ranked])
+                self.store_memory(key, entry)
+                self.count('disk_hits')
+                return entry
+        self.count('misses')
+        words = tokenize(text)
+        entry = (len(words), count_sentences(text), Counter(words).most_common())
+        self.store_memory(key, entry)
+        if self.path is not None:
+            self.store_disk(key, json.dumps(entry))
+        return entry
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.stats[name] += amount
+
+    @staticmethod
+    def entry_size(entry):
+        """
+        Estimates the memory held by an entry, which is several times the length of its JSON text.
+        """
+        word_count, sentence_count, ranked = entry
+        size = sys.getsizeof(entry) + sys.getsizeof(word_count) + sys.getsizeof(sentence_count)
+        size += sys.getsizeof(ranked)
+        for word, count in ranked:
+            size += sys.getsizeof((word, count)) + sys.getsizeof(word) + sys.getsizeof(count)
+        return size
+
+    def store_memory(self, key, entry):
+        size = self.entry_size(entry)
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self.entries[key] = (entry, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                self.size -= self.entries.popitem(last=False)[1][1]
+                self.stats['evictions'] += 1
+
+    def store_disk(self, key, value):
+        with self.connection() as connection:
+            connection.execute('INSERT OR REPLACE INTO analysis_cache VALUES (?, ?, ?, ?)',
+                               (key, value, len(value), time.time()))
+            # Drop the least recently used entries once the file holds more than max_disk_bytes
+            excess = connection.execute('SELECT coalesce(sum(size), 0) FROM analysis_cache').fetchone()[0] \
+                - self.max_disk_bytes
+            while excess > 0:
+                oldest = connection.execute('SELECT key, size FROM analysis_cache ORDER BY used LIMIT 1').fetchone()
+                connection.execute('DELETE FROM analysis_cache WHERE key = ?', (oldest[0],))
+                excess -= oldest[1]
+                self.count('disk_evictions')
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+        if self.path is not None:
+            with self.connection() as connection:
+                connection.execute('DELETE FROM analysis_cache')
+
+    def info(self):
+        """
+        Returns hit/miss statistics and the current size of the cache.
+
+        Returns:
+        dict: hits (memory), disk_hits, misses, evictions, disk_evictions, entries and bytes
+        in memory, and hit_rate over all lookups.
+        """
+        with self.lock:
+            stats = {name: self.stats[name] for name in ('hits', 'disk_hits', 'misses', 'evictions', 'disk_evictions')}
+            stats.update(entries=len(self.entries), bytes=self.size)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else 0
+        return stats
+
+    def analyze(self, text, n=3):
+        """
+        Cached analyze(): returns the same metrics, reusing the stored entry for any n.
+        """
+        word_count, sentence_count, ranked = self.entry(text)
+        return {
+            'word_count': word_count,
+            'sentence_count': sentence_count,
+            'average_sentence_length': word_count / sentence_count if sentence_count > 0 else 0,
+            'most_common_words': ranked if n is None else ranked[:max(n, 0)],
+        }
+
+    def count_words(self, text):
+        return self.entry(text)[0]
+
+    def count_sentences(self, text):
+        return self.entry(text)[1]
+
+    def average_sentence_length(self, text):
+        return self.analyze(text, 0)['average_sentence_length']
+
+    def most_common_words(self, text, n=3):
+        return self.analyze(text, n)['most_common_words']
+
+
+@functools.lru_cache(maxsize=None)
+def character_class_table():
+    """
+    Returns the analyze_arrays character classes for every code point up to U+3001.
+
+    Code points above U+3000 are clamped to the last entry, which is WORD.
+
+    Returns:
+    numpy.ndarray: uint8 classes indexed by code point.
+    """
+    table = np.zeros(WHITESPACE_CODE_POINTS[-1] + 2, dtype=np.uint8)
+    table[:256] = np.frombuffer(CHARACTER_CLASSES, dtype=np.uint8)
+    table[WHITESPACE_CODE_POINTS] = WHITESPACE
+    return table
+
+
+def analyze_arrays(docs):
+    """
+    Counts words and sentences for many documents at once with vectorized NumPy operations.
+
+    The documents are joined into one buffer that is classified character by character in a
+    single table lookup (bytes.translate for ASCII input). Punctuation is dropped with a
+    mask, word starts are found by comparing each position with the previous one, and
+    per-document totals come from binary searches of the matching positions at the document
+    offsets, so there is no Python work per character.
+
+    Parameters:
+    docs (list): The documents (str) to analyze.
+
+    Returns:
+    dict: NumPy arrays word_count and sentence_count (int64) and average_sentence_length
+    (float64, 0 where a document has no sentences), equal element-wise to count_words,
+    count_sentences and average_sentence_length.
+    """
+    if np is None:
+        raise ImportError('analyze_arrays requires NumPy.')
+    if not docs:
+        empty = np.zeros(0, dtype=np.int64)
+        return {'word_count': empty, 'sentence_count': empty.copy(), 'average_sentence_length': empty.astype(np.float64)}
+    # Every document is followed by a space, so no segment is empty and words never run together
+    joined = ' '.join(docs) + ' '
+    lengths = np.fromiter(map(len, docs), dtype=np.int64, count=len(docs))
+    starts = np.cumsum(lengths + 1) - lengths - 1
+    if joined.isascii():
+        classes = np.frombuffer(joined.encode('ascii').translate(CHARACTER_CLASSES), dtype=np.uint8)
+    else:
+        codes = np.frombuffer(joined.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+        classes = character_class_table()[np.minimum(codes, WHITESPACE_CODE_POINTS[-1] + 1)]
+
+    def count_per_document(mask, starts):
+        # Matching positions are sparse; one binary search per document boundary counts them
+        edges = np.append(starts, len(mask))
+        return np.diff(np.searchsorted(np.flatnonzero(mask), edges))
+
+    sentence_count = count_per_document(classes == TERMINATOR, starts)
+    # Words are counted after punctuation is removed, which shifts each document's start
+    removed = classes >= PUNCTUATION
+    starts = starts - np.searchsorted(np.flatnonzero(removed), starts)
+    word_char = classes[~removed] == WORD
+    word_start = word_char.copy()
+    word_start[1:] &= ~word_char[:-1]
+    word_count = count_per_document(word_start, starts)
+
+    average = np.zeros(len(docs), dtype=np.float64)
+    np.divide(word_count, sentence_count, out=average, where=sentence_count > 0)
+    return {'word_count': word_count, 'sentence_count': sentence_count, 'average_sentence_length': average}
+
+
+def analyze_batch(docs, n=3, per_document=True):
+    """
+    Analyzes a batch of documents; the unit of work of analyze_corpus().
+
+    Parameters:
+    docs (list): The documents (str) to analyze.
+    n (int): The number of most common words per document. Defaults to 3.
+    per_document (bool): Whether to return each document's metrics. Defaults to True.
+
+    Returns:
+    tuple: The batch word total, sentence total and word Counter, and a list of
+    per-document analyze() results (empty when per_document is False).
+    """
+    word_count = sentence_count = 0
+    word_counts = Counter()
+    documents = []
+    for doc in docs:
+        words = tokenize(doc)
+        counts = Counter(words)
+        sentences = count_sentences(doc)
+        if per_document:
+            documents.append(summarize(len(words), sentences, counts, n))
+        word_count += len(words)
+        sentence_count += sentences
+        word_counts.update(counts)
+    return word_count, sentence_count, word_counts, documents
+
+
+def analyze_corpus(docs, workers=None, n=3, batch_size=1000, per_document=True):
+    """
+    Analyzes many documents in parallel and merges the results.
+
+    Documents are split into batches that a process pool analyzes independently; the
+    partial word Counters and totals are merged in input order, so the results equal
+    the serial functions exactly. Only a few batches per worker are in flight at once,
+    so docs may be a lazy iterable of any length.
+
+    Parameters:
+    docs (iterable): The documents (str) to analyze.
+    workers (int): Number of worker processes; 1 analyzes in this process. Defaults to the CPU count.
+    n (int): The number of most common words to return. Defaults to 3.
+    batch_size (int): Documents per unit of work. Defaults to 1000.
+    per_document (bool): Whether to return each document's metrics. Defaults to True.
+
+    Returns:
+    dict: 'corpus', the analyze() result for all documents joined by newlines, and
+    'documents', the analyze() result of each document in order (None when per_document is False).
+    """
+    docs = iter(docs)
+    batches = iter(lambda: list(itertools.islice(docs, batch_size)), [])
+    task = functools.partial(analyze_batch, n=n, per_document=per_document)
+    workers = workers or os.cpu_count() or 1
+    word_count = sentence_count = 0
+    word_counts = Counter()
+    documents = [] if per_document else None
+
+    def merge(results):
+        nonlocal word_count, sentence_count
+        for batch_words, batch_sentences, batch_counts, batch_documents in results:
+            word_count += batch_words
+            sentence_count += batch_sentences
+            word_counts.update(batch_counts)
+            if per_document:
+                documents.extend(batch_documents)
+
+    if workers == 1:
+        merge(map(task, batches))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            merge(bounded_map(executor, task, batches, workers * 2))
+    return {'corpus': summarize(word_count, sentence_count, word_counts, n), 'documents': documents}
+
+
+def bounded_map(executor, fn, items, window):
+    """
+    Like executor.map, but submits at most window items ahead of the one being consumed.
+
+    Parameters:
+    executor (Executor): The executor to submit to.
+    fn (callable): The function to apply.
+    items (iterable): The arguments, consumed lazily.
+    window (int): Maximum number of pending futures.
+
     Returns:
-    list: A list of tuples containing the most common words and their counts.
+    iterator: fn(item) for each item, in order.
     """
-    # Remove punctuation and convert to lowercase
-    text = text.translate(str.maketrans('', '', string.punctuation))
-    text = text.lower()
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def read_corpus(path, field='description', encoding='utf-8'):
+    """
+    Yields (name, text) pairs from a directory of text files or an NDJSON file.
+
+    Parameters:
+    path (str): A directory, read recursively in sorted order, or an NDJSON file whose lines
+    are JSON strings or objects.
+    field (str): The object key holding the text in NDJSON lines. Defaults to 'description'.
+    encoding (str): Encoding of the files. Defaults to UTF-8.
+
+    Returns:
+    iterator: (name, text) pairs, named by file path or NDJSON line number.
+    """
+    if os.path.isdir(path):
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories.sort()
+            for name in sorted(files):
+                file_path = os.path.join(directory, name)
+                with open(file_path, encoding=encoding, errors='replace') as f:
+                    yield file_path, f.read()
+        return
+    with open(path, encoding=encoding) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            text = record.get(field) if isinstance(record, dict) else record
+            yield line_number, text if isinstance(text, str) else ''
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Analyze a corpus of documents.')
+    parser.add_argument('path', help='Directory of text files or NDJSON file.')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count).')
+    parser.add_argument('--top', type=int, default=10, help='Number of most common words to report.')
+    parser.add_argument('--field', default='description', help='Text field of NDJSON objects.')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Documents per unit of work.')
+    parser.add_argument('--per-document', action='store_true',
+                        help='Print one JSON line per document before the corpus totals.')
+    args = parser.parse_args(argv)
+
+    names = []
 
-    # Split into words and count them
-    words = text.split()
-    word_counts = Counter(words)
+    def texts():
+        for name, text in read_corpus(args.path, args.field):
+            if args.per_document:
+                names.append(name)
+            yield text
 
-    # Get the most common words and their counts
-    most_common = word_counts.most_common(n)
+    result = analyze_corpus(texts(), args.workers, args.top, args.batch_size, args.per_document)
+    for name, document in zip(names, result['documents'] or ()):
+        print(json.dumps({'document': name, **document}))
+    print(json.dumps(result['corpus']))
+    return 0
 
-    return most_common
 
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        sys.exit(main())
 
-# Import the text analytics program
-# import text_analytics_program
+    # Import the text analytics program
+    # import text_analytics_program
 
-# Define some sample text to analyze
-#sample_text = "This is some sample text. It contains several small sentences, each with different words and punctuation."
-sample_text = "All of us are living in a beautiful asian country called India. Indeed we are happ."
-print (sample_text)
+    # Define some sample text to analyze
+    #sample_text = "This is some sample text. It contains several small sentences, each with different words and punctuation."
+    sample_text = "All of us are living in a beautiful asian country called India. Indeed we are happ."
+    print (sample_text)
 
-# Test the word count function
-#word_count = text_analytics_program.count_words(sample_text)
-word_count = count_words(sample_text)
-expected_word_count = 16 # Counted manually
-assert word_count == expected_word_count, f"Error: word count should be {expected_word_count}, but got {word_count}"
-print(word_count)
+    # Test the word count function
+    #word_count = text_analytics_program.count_words(sample_text)
+    word_count = count_words(sample_text)
+    expected_word_count = 16 # Counted manually
+    assert word_count == expected_word_count, f"Error: word count should be {expected_word_count}, but got {word_count}"
+    print(word_count)
 
-# Test the sentence count function
-#sentence_count = text_analytics_program.count_sentences(sample_text)
-sentence_count = count_sentences(sample_text)
-expected_sentence_count = 2 # Counted manually
-assert sentence_count == expected_sentence_count, f"Error: sentence count should be {expected_sentence_count}, but got {sentence_count}"
-print(sentence_count)
+    # Test the sentence count function
+    #sentence_count = text_analytics_program.count_sentences(sample_text)
+    sentence_count = count_sentences(sample_text)
+    expected_sentence_count = 2 # Counted manually
+    assert sentence_count == expected_sentence_count, f"Error: sentence count should be {expected_sentence_count}, but got {sentence_count}"
+    print(sentence_count)
 
-# Test the average sentence length function
-#average_sentence_length = text_analytics_program.average_sentence_length(sample_text)
-average_sentence_length = average_sentence_length(sample_text)
-expected_average_sentence_length = 8 # Counted manually
-assert average_sentence_length == expected_average_sentence_length, f"Error: average sentence length should be {expected_average_sentence_length}, but got {average_sentence_length}"
+    # Test the average sentence length function
+    #average_sentence_length = text_analytics_program.average_sentence_length(sample_text)
+    average_sentence_length = average_sentence_length(sample_text)
+    expected_average_sentence_length = 8 # Counted manually
+    assert average_sentence_length == expected_average_sentence_length, f"Error: average sentence length should be {expected_average_sentence_length}, but got {average_sentence_length}"
 
-# Test the most common words function
-#most_common_words = text_analytics_program.most_common_words(sample_text)
-most_common_words = most_common_words(sample_text)
-expected_most_common_words = [("are", 2), ("all", 1), ("of", 1)] # Counted manually
-assert most_common_words == expected_most_common_words, f"Error: most common words should be {expected_most_common_words}, but got {most_common_words}"
-print(most_common_words)
+    # Test the most common words function
+    #most_common_words = text_analytics_program.most_common_words(sample_text)
+    most_common_words = most_common_words(sample_text)
+    expected_most_common_words = [("are", 2), ("all", 1), ("of", 1)] # Counted manually
+    assert most_common_words == expected_most_common_words, f"Error: most common words should be {expected_most_common_words}, but got {most_common_words}"
+    print(most_common_words)
 
 
-print("All tests passed!")
+    print("All tests passed!")
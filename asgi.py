@@ -0,0 +1,197 @@
+"""
+ASGI entry point for the destination API.
+
+Serves the /destination routes from main.py on an async SQLAlchemy engine
+(aiosqlite for the default SQLite database), so a single process can hold
+many concurrent connections while requests wait on the database. Response
+bodies and status codes match the Flask views, and writes maintain the same
+description analytics and word counts.
+
+Run with any ASGI server, for example:
+    uvicorn asgi:application --workers 1
+"""
+import json
+import os
+import re
+from urllib.parse import parse_qsl
+
+from marshmallow import ValidationError
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session as SyncSession
+
+from main import (Destination, DestinationSchema, app, apply_collected_word_deltas, collect_word_deltas,
+                  compute_destination_analytics, discard_word_deltas, json_encoder, row_serializer)
+
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'postgres': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+
+def async_database_url(url):
+    """
+    Rewrites a synchronous database URL to use an async driver.
+
+    Parameters:
+    url (str): The SQLALCHEMY_DATABASE_URI used by the Flask app.
+
+    Returns:
+    str: The same database addressed through its async driver.
+    """
+    scheme, _, rest = url.partition('://')
+    return ASYNC_DRIVERS.get(scheme.split('+')[0], scheme) + '://' + rest
+
+
+engine = create_async_engine(
+    os.environ.get('ASYNC_DATABASE_URL') or async_database_url(app.config['SQLALCHEMY_DATABASE_URI']),
+    **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+
+
+class WriteSession(SyncSession):
+    """
+    Synchronous session behind each async session.
+
+    It carries the same write hooks as the Flask db.session. Destinations
+    created here therefore get their analytics row, and their words are
+    added to the catalogue-wide counts in the same transaction.
+    """
+
+
+for identifier, listener in (('before_flush', compute_destination_analytics),
+                             ('before_flush', collect_word_deltas),
+                             ('after_flush', apply_collected_word_deltas),
+                             ('after_rollback', discard_word_deltas)):
+    event.listen(WriteSession, identifier, listener)
+
+Session = async_sessionmaker(engine, expire_on_commit=False, sync_session_class=WriteSession)
+
+
+# aiosqlite connections are not sqlite3.Connection objects, so apply the engine profile here
+@event.listens_for(engine.sync_engine, 'connect')
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    if engine.dialect.name != 'sqlite':
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma, value in app.config['SQLITE_PRAGMAS'].items():
+        cursor.execute(f'PRAGMA {pragma} = {value}')
+    cursor.close()
+
+
+async def read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+
+async def send_json(send, result, status):
+    body = json_encoder()(result) + b'\n'
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json'),
+                            (b'content-length', str(len(body)).encode())]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def query_int(params, name, minimum, maximum=None):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer.')
+    if value < minimum:
+        raise ValueError(f'{name} must be at least {minimum}.')
+    return min(value, maximum) if maximum is not None else value
+
+
+async def create_destination(receive):
+    try:
+        destination_data = json.loads(await read_body(receive))
+    except ValueError:
+        return {'error': 'Request body must be valid JSON.'}, 400
+    destination_schema = DestinationSchema()
+    async with Session() as session:
+        try:
+            # Validate with the same schema as the Flask view, then insert on the async session
+            errors = destination_schema.validate(destination_data)
+            if errors:
+                raise ValidationError(errors)
+            destination = Destination(**destination_data)
+            session.add(destination)
+            await session.commit()
+            return destination_schema.dump(destination), 201
+        except IntegrityError:
+            # Handle unique constraint violation error
+            await session.rollback()
+            return {'error': 'Destination name must be unique.'}, 400
+        except Exception as e:
+            # Handle any other error
+            await session.rollback()
+            return {'error': str(e)}, 400
+
+
+async def get_destinations(params):
+    try:
+        after_id = query_int(params, 'after_id', 0)
+        limit = query_int(params, 'limit', 1, app.config['DESTINATION_MAX_PAGE_SIZE'])
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    columns, serialize = row_serializer()
+    statement = select(*columns).order_by(Destination.id)
+    async with Session() as session:
+        if after_id is None and limit is None:
+            rows = await session.execute(statement)
+            return [serialize(row) for row in rows], 200
+
+        # Keyset pagination, same shape as the Flask view
+        limit = limit or app.config['DESTINATION_PAGE_SIZE']
+        if after_id is not None:
+            statement = statement.where(Destination.id > after_id)
+        rows = (await session.execute(statement.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {'items': [serialize(row) for row in rows], 'next_after_id': rows[-1][0] if has_more else None}, 200
+
+
+async def get_destination(destination_id):
+    columns, serialize = row_serializer()
+    async with Session() as session:
+        row = (await session.execute(select(*columns).where(Destination.id == destination_id))).first()
+    if row:
+        return serialize(row), 200
+    return {'error': 'Destination not found.'}, 404
+
+
+DESTINATION_PATH = re.compile(r'^/destination/(?P<destination_id>[^/]+)$')
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    path, method = scope['path'], scope['method']
+    if path == '/destination' and method == 'POST':
+        result, status = await create_destination(receive)
+    elif path == '/destination' and method == 'GET':
+        result, status = await get_destinations(dict(parse_qsl(scope['query_string'].decode())))
+    elif DESTINATION_PATH.match(path) and method == 'GET':
+        result, status = await get_destination(DESTINATION_PATH.match(path)['destination_id'])
+    elif path == '/destination' or DESTINATION_PATH.match(path):
+        result, status = {'error': 'Method not allowed.'}, 405
+    else:
+        result, status = {'error': 'Not found.'}, 404
+    await send_json(send, result, status)
@@ -0,0 +1,245 @@
+"""
+Benchmark and regression suite for Textanalytics.py.
+
+Generates synthetic texts of the requested sizes (1KB up to 1GB) for each vocabulary size
+and punctuation density, then times count_words, count_sentences, average_sentence_length,
+most_common_words and the faster variants (analyze, analyze_stream, approximate
+most_common_words, a warm AnalysisCache and, with NumPy, analyze_arrays). Throughput is
+reported in MB/s and peak memory in MB. Results can be saved as a JSON baseline, and later
+runs fail with exit status 1 when they regress past the threshold.
+
+Timings and memory are measured in separate runs because tracemalloc slows every
+allocation. Importing Textanalytics does not run its sample self-test.
+
+Example:
+    python benchmarktesting.py --sizes 1KB 1MB 100MB --save-baseline
+    python benchmarktesting.py --sizes 1KB 1MB 100MB
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import Textanalytics
+
+SIZES = ('1KB', '1MB', '10MB', '100MB', '1GB')
+UNITS = {'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'B': 1}
+PUNCTUATION = ('.', '.', '!', '?', ',', ',', ';', ':', '-', "'")
+# Texts are built by repeating a block of at most this many characters
+BLOCK_SIZE = 4 * 1024 * 1024
+# Characters per document when a text is split for analyze_arrays
+DOCUMENT_SIZE = 512
+
+
+def parse_size(label):
+    """
+    Converts a size label such as 1KB, 10MB or 1GB to a number of characters.
+
+    Parameters:
+    label (str): The size label.
+
+    Returns:
+    int: The size in characters.
+    """
+    for unit in ('KB', 'MB', 'GB', 'B'):
+        if label.upper().endswith(unit):
+            return int(float(label[:-len(unit)]) * UNITS[unit])
+    return int(label)
+
+
+def synthetic_text(size, vocabulary, punctuation, seed=0):
+    """
+    Builds an ASCII text of exactly size characters.
+
+    Words are drawn from a Zipf-like distribution over the vocabulary, and after each word a
+    punctuation mark follows with the given probability. Texts longer than BLOCK_SIZE repeat
+    one generated block, so generating 1GB does not dominate the run.
+
+    Parameters:
+    size (int): Length of the text in characters.
+    vocabulary (int): Number of distinct words.
+    punctuation (float): Probability of a punctuation mark after each word.
+    seed (int): Random seed, so every run sees the same text.
+
+    Returns:
+    str: The text.
+    """
+    rng = random.Random(seed)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 10)))
+             for _ in range(vocabulary)]
+    weights = [1 / rank for rank in range(1, vocabulary + 1)]
+    parts, length = [], 0
+    block_size = min(size, BLOCK_SIZE)
+    while length < block_size:
+        batch = rng.choices(words, weights, k=4096)
+        for word in batch:
+            if rng.random() < punctuation:
+                word += rng.choice(PUNCTUATION)
+            parts.append(word)
+            length += len(word) + 1
+    block = ' '.join(parts)[:block_size]
+    repeats, remainder = divmod(size, len(block))
+    return block * repeats + block[:remainder]
+
+
+def variants(text, names=None):
+    """
+    Builds the benchmarked functions for one text.
+
+    Parameters:
+    text (str): The text every function analyzes.
+    names (list): Only build these functions. Defaults to all of them.
+
+    Returns:
+    dict: Function name mapped to a zero-argument callable.
+    """
+    functions = {
+        'count_words': lambda: Textanalytics.count_words(text),
+        'count_sentences': lambda: Textanalytics.count_sentences(text),
+        'average_sentence_length': lambda: Textanalytics.average_sentence_length(text),
+        'most_common_words': lambda: Textanalytics.most_common_words(text),
+        'analyze': lambda: Textanalytics.analyze(text),
+        'analyze_stream': lambda: Textanalytics.analyze_stream(
+            text[start:start + 1024 * 1024] for start in range(0, len(text), 1024 * 1024)),
+        'most_common_words_approximate': lambda: Textanalytics.most_common_words(text, approximate=True),
+    }
+    if not names or 'analyze_cached' in names:
+        cache = Textanalytics.AnalysisCache(max_bytes=1024 ** 3)
+        cache.analyze(text)
+        functions['analyze_cached'] = lambda: cache.analyze(text)
+    if Textanalytics.np is not None and (not names or 'analyze_arrays' in names):
+        documents = [text[start:start + DOCUMENT_SIZE] for start in range(0, len(text), DOCUMENT_SIZE)]
+        functions['analyze_arrays'] = lambda: Textanalytics.analyze_arrays(documents)
+    return {name: function for name, function in functions.items() if not names or name in names}
+
+
+def time_function(function, repeat):
+    """
+    Returns the best wall-clock time of several calls, with garbage collection paused.
+
+    Parameters:
+    function (callable): The function to time.
+    repeat (int): Number of calls.
+
+    Returns:
+    float: The fastest call in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - started)
+        finally:
+            gc.enable()
+    return best
+
+
+def peak_memory(function):
+    """
+    Returns the peak memory the function allocates above what was allocated before the call.
+
+    Parameters:
+    function (callable): The function to measure.
+
+    Returns:
+    float: Peak additional memory in MB.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 ** 2
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """
+    Finds results that regressed past the threshold relative to the baseline.
+
+    Parameters:
+    results (dict): Current results keyed by "<size>/v<vocabulary>/p<punctuation>/<function>".
+    baseline (dict): Baseline results with the same keys.
+    threshold (float): Allowed relative change, e.g. 0.2 for 20%.
+
+    Returns:
+    list: Human-readable descriptions of each regression.
+    """
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        if result['mb_per_s'] < reference['mb_per_s'] * (1 - threshold):
+            regressions.append(f"{key}: {result['mb_per_s']:.1f} MB/s vs baseline {reference['mb_per_s']:.1f} MB/s")
+        if result.get('peak_mb') is not None and reference.get('peak_mb') is not None \
+                and result['peak_mb'] > reference['peak_mb'] * (1 + threshold) + 0.1:
+            regressions.append(f"{key}: peak memory {result['peak_mb']:.1f} MB "
+                               f"vs baseline {reference['peak_mb']:.1f} MB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Textanalytics functions.')
+    parser.add_argument('--sizes', nargs='+', default=['1KB', '1MB', '10MB'],
+                        help=f'Text sizes to benchmark (standard sizes: {SIZES}).')
+    parser.add_argument('--vocabulary', type=int, nargs='+', default=[1000, 100000],
+                        help='Vocabulary sizes of the synthetic texts.')
+    parser.add_argument('--punctuation', type=float, nargs='+', default=[0.05, 0.3],
+                        help='Probabilities of a punctuation mark after each word.')
+    parser.add_argument('--functions', nargs='+', help='Only benchmark these functions.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed calls per function; the best is kept.')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the peak memory measurement.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic texts.')
+    parser.add_argument('--baseline', default='textbenchmark_baseline.json', help='Baseline JSON file.')
+    parser.add_argument('--save-baseline', action='store_true', help='Write results as the new baseline.')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed regression, e.g. 0.2 for 20%%.')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for label in args.sizes:
+        size = parse_size(label)
+        for vocabulary in args.vocabulary:
+            for punctuation in args.punctuation:
+                text = synthetic_text(size, vocabulary, punctuation, args.seed)
+                functions = variants(text, args.functions)
+                for name, function in functions.items():
+                    seconds = time_function(function, args.repeat)
+                    result = {
+                        'seconds': seconds,
+                        'mb_per_s': size / 1024 ** 2 / seconds if seconds else 0,
+                        'peak_mb': None if args.no_memory else peak_memory(function),
+                    }
+                    key = f'{label}/v{vocabulary}/p{punctuation}/{name}'
+                    results[key] = result
+                    peak = '' if result['peak_mb'] is None else f"  peak {result['peak_mb']:>9.1f} MB"
+                    print(f"{label:>6} v{vocabulary:<7} p{punctuation:<5} {name:<30} "
+                          f"{result['mb_per_s']:>9.1f} MB/s  {seconds * 1000:>10.2f} ms{peak}")
+                del text, functions
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f'Baseline written to {args.baseline}', file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}; run with --save-baseline to create one.', file=sys.stderr)
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare_to_baseline(results, json.load(f), args.threshold)
+    for regression in regressions:
+        print('REGRESSION ' + regression, file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
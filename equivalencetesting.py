@@ -0,0 +1,280 @@
+"""
+Equivalence checks for the optimized Textanalytics.py functions.
+
+Each check generates randomized texts (ASCII and Unicode words, Unicode whitespace,
+punctuation and sentence terminators) and compares the optimized code paths with the
+original one-function-per-metric implementation kept below as the reference. Any
+mismatch is printed with the text that caused it and the script exits with status 1.
+
+Example:
+    python equivalencetesting.py
+    python equivalencetesting.py --iterations 2000 --seed 7 --checks analyze
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+from collections import Counter
+
+import Textanalytics
+
+WORD_CHARACTERS = string.ascii_letters + string.digits + 'éßçøΣπжё中文ﬁİ'
+WHITESPACE = (' ', ' ', ' ', '\n', '\t', ' ', ' ', '　')
+PUNCTUATION = ('.', '!', '?', ',', ';', ':', '-', "'", '"', '(', ')', '...', '?!')
+
+
+def reference_count_words(text):
+    """
+    Counts words exactly as the original implementation did.
+    """
+    return len(text.translate(str.maketrans('', '', string.punctuation)).lower().split())
+
+
+def reference_count_sentences(text):
+    """
+    Counts sentence-ending punctuation marks exactly as the original implementation did.
+    """
+    return text.count('.') + text.count('!') + text.count('?')
+
+
+def reference_average_sentence_length(text):
+    """
+    Computes the average sentence length exactly as the original implementation did.
+    """
+    sentence_count = reference_count_sentences(text)
+    return reference_count_words(text) / sentence_count if sentence_count > 0 else 0
+
+
+def reference_most_common_words(text, n=3):
+    """
+    Finds the most common words exactly as the original implementation did.
+    """
+    return Counter(text.translate(str.maketrans('', '', string.punctuation)).lower().split()).most_common(n)
+
+
+def reference_analyze(text, n=3):
+    """
+    Returns the analyze() result built from the original functions.
+    """
+    return {
+        'word_count': reference_count_words(text),
+        'sentence_count': reference_count_sentences(text),
+        'average_sentence_length': reference_average_sentence_length(text),
+        'most_common_words': reference_most_common_words(text, n),
+    }
+
+
+def random_text(rng, max_words=200):
+    """
+    Builds a random text mixing words, whitespace and punctuation.
+
+    Parameters:
+    rng (random.Random): Random source.
+    max_words (int): Upper bound on the number of words.
+
+    Returns:
+    str: The text, possibly empty or starting and ending with whitespace or punctuation.
+    """
+    vocabulary = [''.join(rng.choice(WORD_CHARACTERS) for _ in range(rng.randint(1, 8)))
+                  for _ in range(rng.randint(1, 30))]
+    parts = []
+    for _ in range(rng.randint(0, max_words)):
+        if rng.random() < 0.2:
+            parts.append(rng.choice(PUNCTUATION))
+        parts.append(rng.choice(vocabulary))
+        if rng.random() < 0.3:
+            parts.append(rng.choice(PUNCTUATION))
+        parts.append(rng.choice(WHITESPACE) * rng.randint(1, 2))
+    if parts and rng.random() < 0.5:
+        parts.pop()
+    return ''.join(parts)
+
+
+def check_analyze(rng, iterations):
+    """
+    analyze() and the single-metric wrappers equal the original functions.
+
+    Parameters:
+    rng (random.Random): Random source.
+    iterations (int): Number of random texts.
+
+    Returns:
+    list: Descriptions of each mismatch.
+    """
+    failures = []
+    for i in range(iterations):
+        text = random_text(rng)
+        n = rng.choice((0, 1, 3, 10, None))
+        expected = reference_analyze(text, n)
+        actual = {
+            'analyze': Textanalytics.analyze(text, n),
+            'functions': {
+                'word_count': Textanalytics.count_words(text),
+                'sentence_count': Textanalytics.count_sentences(text),
+                'average_sentence_length': Textanalytics.average_sentence_length(text),
+                'most_common_words': Textanalytics.most_common_words(text, n),
+            },
+        }
+        for name, result in actual.items():
+            if result != expected:
+                failures.append(f'{name} differs on text {i} (n={n}): {text!r}')
+    return failures
+
+
+def random_chunks(rng, data):
+    """
+    Splits a str or bytes value at random offsets, including empty chunks.
+
+    Parameters:
+    rng (random.Random): Random source.
+    data (str or bytes): The value to split.
+
+    Returns:
+    list: Chunks whose concatenation equals data.
+    """
+    offsets = sorted(rng.randint(0, len(data)) for _ in range(rng.randint(0, 12)))
+    return [data[start:end] for start, end in zip([0] + offsets, offsets + [len(data)])]
+
+
+def check_stream(rng, iterations):
+    """
+    analyze_stream() over random str chunkings, random UTF-8 byte chunkings (splitting
+    multi-byte characters) and a file read in small slices equals the original functions,
+    including the tie order of the most common words.
+
+    Parameters:
+    rng (random.Random): Random source.
+    iterations (int): Number of random texts.
+
+    Returns:
+    list: Descriptions of each mismatch.
+    """
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'text.txt')
+        for i in range(iterations):
+            text = random_text(rng)
+            n = rng.choice((0, 1, 3, 10, None))
+            expected = reference_analyze(text, n)
+            data = text.encode('utf-8')
+            with open(path, 'wb') as f:
+                f.write(data)
+            actual = {
+                'str chunks': Textanalytics.analyze_stream(random_chunks(rng, text), n),
+                'bytes chunks': Textanalytics.analyze_stream(random_chunks(rng, data), n),
+                'file': Textanalytics.analyze_stream(path, n, chunk_size=rng.randint(1, 64)),
+            }
+            for name, result in actual.items():
+                if result != expected:
+                    failures.append(f'{name} differ on text {i} (n={n}): {text!r}')
+    return failures
+
+
+def check_arrays(rng, iterations):
+    """
+    analyze_arrays() equals the original per-document functions element-wise, for ASCII-only
+    batches, Unicode batches and documents containing lone surrogates. Skipped without NumPy.
+
+    Parameters:
+    rng (random.Random): Random source.
+    iterations (int): Number of random batches.
+
+    Returns:
+    list: Descriptions of each mismatch.
+    """
+    if Textanalytics.np is None:
+        print('arrays check skipped: NumPy is not installed.', file=sys.stderr)
+        return []
+    failures = []
+    for i in range(iterations):
+        docs = [random_text(rng, max_words=20) for _ in range(rng.randint(0, 20))]
+        if rng.random() < 0.3:
+            docs = [doc.encode('ascii', 'ignore').decode() for doc in docs]
+        elif docs and rng.random() < 0.2:
+            docs[rng.randrange(len(docs))] += ' \ud800x.'
+        expected = {
+            'word_count': [reference_count_words(doc) for doc in docs],
+            'sentence_count': [reference_count_sentences(doc) for doc in docs],
+            'average_sentence_length': [reference_average_sentence_length(doc) for doc in docs],
+        }
+        actual = {name: values.tolist() for name, values in Textanalytics.analyze_arrays(docs).items()}
+        if actual != expected:
+            failures.append(f'batch {i} differs: {docs!r}')
+    return failures
+
+
+def check_cache(rng, iterations):
+    """
+    AnalysisCache answers equal the original functions for memory hits, misses after
+    eviction and disk hits, for any n including None.
+
+    Parameters:
+    rng (random.Random): Random source.
+    iterations (int): Number of lookups.
+
+    Returns:
+    list: Descriptions of each mismatch.
+    """
+    failures = []
+    texts = [random_text(rng) for _ in range(max(1, iterations // 5))]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.db')
+        # A small memory tier forces evictions; the second cache only shares the file, so its
+        # first lookups of each text are disk hits
+        caches = {'memory': Textanalytics.AnalysisCache(max_bytes=64 * 1024),
+                  'disk': Textanalytics.AnalysisCache(max_bytes=64 * 1024, path=path)}
+        for i in range(iterations):
+            if i == iterations // 2:
+                caches['disk'] = Textanalytics.AnalysisCache(max_bytes=64 * 1024, path=path)
+            text = rng.choice(texts)
+            n = rng.choice((0, 1, 3, 10, None))
+            expected = reference_analyze(text, n)
+            for name, cache in caches.items():
+                actual = {
+                    'analyze': cache.analyze(text, n),
+                    'functions': {
+                        'word_count': cache.count_words(text),
+                        'sentence_count': cache.count_sentences(text),
+                        'average_sentence_length': cache.average_sentence_length(text),
+                        'most_common_words': cache.most_common_words(text, n),
+                    },
+                }
+                for kind, result in actual.items():
+                    if result != expected:
+                        failures.append(f'{name} cache {kind} differs on lookup {i} (n={n}): {text!r}')
+        if not caches['disk'].info()['disk_hits']:
+            failures.append('the reopened disk cache never served a disk hit')
+    return failures
+
+
+CHECKS = {
+    'analyze': check_analyze,
+    'stream': check_stream,
+    'arrays': check_arrays,
+    'cache': check_cache,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check optimized Textanalytics functions against the originals.')
+    parser.add_argument('--iterations', type=int, default=500, help='Random texts per check.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    parser.add_argument('--checks', nargs='+', choices=sorted(CHECKS), help='Only run these checks.')
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for name, check in CHECKS.items():
+        if args.checks and name not in args.checks:
+            continue
+        failures = check(random.Random(f'{args.seed}/{name}'), args.iterations)
+        for failure in failures[:10]:
+            print(f'MISMATCH {name}: {failure}', file=sys.stderr)
+        failed += bool(failures)
+        print(f'{name:<10} {"FAILED" if failures else "ok"} ({len(failures)} mismatches)')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
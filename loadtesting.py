@@ -0,0 +1,354 @@
+"""
+Load test and benchmark harness for the destination API.
+
+Seeds a SQLite database with synthetic destinations, serves main.app through a
+local threaded WSGI server and drives POST /destination, GET /destination and
+GET /destination/<id> at a fixed concurrency. Throughput and p50/p95/p99
+latencies are printed, can be saved as a JSON baseline, and later runs fail
+with exit status 1 when they regress past the threshold.
+
+Example:
+    python loadtesting.py --rows 10000 100000 --concurrency 16 --save-baseline
+    python loadtesting.py --rows 10000 100000 --concurrency 16
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from itertools import count
+
+DATASET_SIZES = (10000, 100000, 1000000)
+WORDS = ('fort', 'palace', 'temple', 'museum', 'garden', 'market', 'lake', 'step', 'well', 'gate',
+         'heritage', 'ancient', 'royal', 'carved', 'painted', 'marble', 'sandstone', 'festival',
+         'craft', 'music', 'dance', 'silk', 'spice', 'river', 'hill', 'desert', 'mirror', 'tower')
+CATEGORIES = ('museum', 'fort', 'temple', 'palace', 'garden', 'market')
+LOCATIONS = ('Jaipur', 'Delhi', 'Agra', 'Udaipur', 'Varanasi', 'Mysuru', 'Kochi', 'Hampi')
+
+
+def percentile(samples, fraction):
+    """
+    Returns the nearest-rank percentile of an already sorted list of samples.
+
+    Parameters:
+    samples (list): Sorted latencies in seconds.
+    fraction (float): Percentile between 0 and 1.
+
+    Returns:
+    float: The percentile value, or 0 when there are no samples.
+    """
+    if not samples:
+        return 0
+    return samples[min(len(samples) - 1, max(0, int(round(fraction * len(samples))) - 1))]
+
+
+def synthetic_destination(i, rng):
+    """
+    Builds one synthetic destination row.
+
+    Parameters:
+    i (int): Sequence number, used to keep names unique.
+    rng (random.Random): Random source.
+
+    Returns:
+    dict: Column values for a Destination.
+    """
+    sentences = []
+    for _ in range(rng.randint(2, 6)):
+        sentences.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 15))).capitalize() + '.')
+    return {
+        'name': f'Destination {i}',
+        'description': ' '.join(sentences),
+        'image_url': f'https://example.com/images/{i}.jpg',
+        'location': rng.choice(LOCATIONS),
+        'contact': f'contact{i}@example.com',
+        'website_url': f'https://example.com/destinations/{i}',
+        'category': rng.choice(CATEGORIES),
+    }
+
+
+def seed_database(main, rows, chunk_size=10000, seed=0):
+    """
+    Creates the tables and inserts synthetic destinations in chunked transactions.
+
+    Parameters:
+    main (module): The imported main module.
+    rows (int): Number of destinations the table should hold.
+    chunk_size (int): Rows inserted per transaction.
+    seed (int): Random seed, so every run sees the same dataset.
+    """
+    from sqlalchemy import insert
+
+    rng = random.Random(seed)
+    with main.app.app_context():
+        main.db.create_all()
+        existing = main.Destination.query.count()
+        for start in range(existing, rows, chunk_size):
+            batch = [synthetic_destination(i, rng) for i in range(start, min(rows, start + chunk_size))]
+            main.db.session.execute(insert(main.Destination), batch)
+            main.db.session.commit()
+            print(f'  seeded {start + len(batch)}/{rows} rows', file=sys.stderr)
+
+
+def remove_created_rows(main):
+    """
+    Deletes the destinations created by the POST scenario, so every run measures the seeded table.
+
+    Rows are deleted through the ORM session so their analytics and word counts are removed too.
+
+    Parameters:
+    main (module): The imported main module.
+
+    Returns:
+    int: Number of destinations deleted.
+    """
+    with main.app.app_context():
+        destinations = main.Destination.query.filter(main.Destination.name.like('Load test %')).all()
+        for destination in destinations:
+            main.db.session.delete(destination)
+        main.db.session.commit()
+    return len(destinations)
+
+
+class LocalServer:
+    """
+    Serves a WSGI app from a background thread on an ephemeral localhost port.
+    """
+
+    def __init__(self, app):
+        from werkzeug.serving import WSGIRequestHandler, make_server
+
+        class QuietRequestHandler(WSGIRequestHandler):
+            # HTTP/1.1 keeps client connections open between requests
+            protocol_version = 'HTTP/1.1'
+
+            def log_request(self, *args, **kwargs):
+                pass
+
+        self.server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietRequestHandler)
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.thread.join()
+
+
+def run_scenario(port, make_request, requests, concurrency, warmup=50):
+    """
+    Sends requests from a fixed number of client threads and measures latency.
+
+    Parameters:
+    port (int): Port of the local server.
+    make_request (callable): Returns (method, path, body) for the next request.
+    requests (int): Total number of measured requests.
+    concurrency (int): Number of client threads, each with its own connection.
+    warmup (int): Unmeasured requests sent first to warm caches and connections.
+
+    Returns:
+    dict: Throughput in requests per second, latency percentiles in milliseconds
+    and the number of unexpected (5xx or connection) errors.
+    """
+    lock = threading.Lock()
+    latencies = []
+    errors = [0]
+    remaining = count()
+
+    def send(connection):
+        method, path, body = make_request()
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        started = time.perf_counter()
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        return time.perf_counter() - started, response.status
+
+    def worker():
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        local = []
+        while next(remaining) < requests:
+            try:
+                elapsed, status = send(connection)
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port)
+                with lock:
+                    errors[0] += 1
+                continue
+            if status >= 500:
+                with lock:
+                    errors[0] += 1
+            local.append(elapsed)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    for _ in range(warmup):
+        send(connection)
+    connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'throughput': len(latencies) / elapsed if elapsed else 0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+
+def scenarios(rows, page_size, seed=0):
+    """
+    Builds the request generators for each benchmarked route.
+
+    Parameters:
+    rows (int): Number of seeded destinations, used to pick existing ids.
+    page_size (int): limit used for GET /destination.
+    seed (int): Random seed for id selection.
+
+    Returns:
+    dict: Scenario name mapped to a callable returning (method, path, body).
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    created = count()
+    run_id = f'{os.getpid()}-{int(time.time())}'
+
+    def create():
+        with lock:
+            i = next(created)
+            destination = synthetic_destination(i, rng)
+        destination['name'] = f'Load test {run_id} {i}'
+        return 'POST', '/destination', json.dumps(destination)
+
+    def list_page():
+        with lock:
+            after_id = rng.randrange(max(1, rows - page_size))
+        return 'GET', f'/destination?after_id={after_id}&limit={page_size}', None
+
+    def detail():
+        with lock:
+            destination_id = rng.randint(1, rows)
+        return 'GET', f'/destination/{destination_id}', None
+
+    return {
+        'POST /destination': create,
+        'GET /destination': list_page,
+        'GET /destination/<id>': detail,
+    }
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """
+    Finds results that regressed past the threshold relative to the baseline.
+
+    Parameters:
+    results (dict): Current results keyed by "<rows>/<scenario>".
+    baseline (dict): Baseline results with the same keys.
+    threshold (float): Allowed relative change, e.g. 0.2 for 20%.
+
+    Returns:
+    list: Human-readable descriptions of each regression.
+    """
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        if result['throughput'] < reference['throughput'] * (1 - threshold):
+            regressions.append(f"{key}: throughput {result['throughput']:.1f} req/s "
+                               f"vs baseline {reference['throughput']:.1f} req/s")
+        for metric in ('p95_ms', 'p99_ms'):
+            if result[metric] > reference[metric] * (1 + threshold):
+                regressions.append(f'{key}: {metric} {result[metric]:.2f} vs baseline {reference[metric]:.2f}')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the destination API.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[DATASET_SIZES[0]],
+                        help=f'Dataset sizes to seed and test (standard sizes: {DATASET_SIZES}).')
+    parser.add_argument('--concurrency', type=int, default=8, help='Number of concurrent clients.')
+    parser.add_argument('--requests', type=int, default=2000, help='Measured requests per scenario.')
+    parser.add_argument('--page-size', type=int, default=100, help='limit used for GET /destination.')
+    parser.add_argument('--data-dir', default=tempfile.gettempdir(), help='Where seeded databases are kept.')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the response and object caches.')
+    parser.add_argument('--baseline', default='loadtest_baseline.json', help='Baseline JSON file.')
+    parser.add_argument('--save-baseline', action='store_true', help='Write results as the new baseline.')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed regression, e.g. 0.2 for 20%%.')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for rows in args.rows:
+        # main reads DATABASE_URL at import time, so each dataset runs in a fresh interpreter
+        # when several sizes are requested; a single size runs in-process
+        if len(args.rows) > 1:
+            output = tempfile.NamedTemporaryFile(suffix='.json', delete=False).name
+            command = [sys.executable, __file__, '--rows', str(rows), '--concurrency', str(args.concurrency),
+                       '--requests', str(args.requests), '--page-size', str(args.page_size),
+                       '--data-dir', args.data_dir, '--baseline', output, '--save-baseline']
+            if args.no_cache:
+                command.append('--no-cache')
+            subprocess.run(command, check=True)
+            with open(output) as f:
+                results.update(json.load(f))
+            os.remove(output)
+            continue
+
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(args.data_dir, f'loadtest_{rows}.db')
+        import main as destination_api
+        print(f'Seeding {rows} destinations...', file=sys.stderr)
+        seed_database(destination_api, rows)
+        if args.no_cache:
+            # GET /destination/<id> is served by the hot-object cache, the other routes by the response cache
+            destination_api.response_cache.max_entries = 0
+            destination_api.app.config['DESTINATION_OBJECT_CACHE_SIZE'] = 0
+            destination_api.get_object_cache().max_entries = 0
+        try:
+            with LocalServer(destination_api.app) as server:
+                for name, make_request in scenarios(rows, args.page_size).items():
+                    result = run_scenario(server.port, make_request, args.requests, args.concurrency)
+                    results[f'{rows}/{name}'] = result
+                    print(f"{rows:>8} {name:<24} {result['throughput']:>9.1f} req/s  "
+                          f"p50 {result['p50_ms']:>7.2f} ms  p95 {result['p95_ms']:>7.2f} ms  "
+                          f"p99 {result['p99_ms']:>7.2f} ms  errors {result['errors']}")
+        finally:
+            print(f'Removed {remove_created_rows(destination_api)} rows created by the run.', file=sys.stderr)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f'Baseline written to {args.baseline}', file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}; run with --save-baseline to create one.', file=sys.stderr)
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare_to_baseline(results, json.load(f), args.threshold)
+    for regression in regressions:
+        print('REGRESSION ' + regression, file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,14 +1,120 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, has_app_context, has_request_context, jsonify, request, stream_with_context
+from flask import json
+from flask.cli import AppGroup
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_marshmallow import Marshmallow
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import event, func, or_, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import attributes
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from marshmallow import ValidationError
+from marshmallow.validate import Range
+import click
+import functools
+import hashlib
+import heapq
+import math
 import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+from Textanalytics import analyze, most_common_words
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Initialize Flask app, SQLAlchemy database, and Marshmallow serializer
 app = Flask(__name__)
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL') or 'sqlite:///cultural_destinations.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db = SQLAlchemy(app)
+# Page sizes for keyset pagination and row batch size for streamed list responses
+app.config.setdefault('DESTINATION_PAGE_SIZE', 100)
+app.config.setdefault('DESTINATION_MAX_PAGE_SIZE', 1000)
+app.config.setdefault('DESTINATION_STREAM_BATCH_SIZE', 1000)
+# Limits for bulk creation: maximum items per request and rows per transaction
+app.config.setdefault('DESTINATION_BATCH_MAX_ITEMS', 10000)
+app.config.setdefault('DESTINATION_BATCH_CHUNK_SIZE', 1000)
+# Maximum number of serialized GET responses kept in the in-process response cache, and their TTL
+# in seconds. The TTL bounds how long a response read from a lagging replica, or made stale by a
+# write in another process, can be served
+app.config.setdefault('DESTINATION_RESPONSE_CACHE_SIZE', 256)
+app.config.setdefault('DESTINATION_RESPONSE_CACHE_TTL', float(os.environ.get('DESTINATION_RESPONSE_CACHE_TTL', 5)))
+# Total bytes of response bodies the cache may hold, and the largest single body it will keep
+app.config.setdefault('DESTINATION_RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+app.config.setdefault('DESTINATION_RESPONSE_CACHE_MAX_ENTRY_BYTES', 1024 * 1024)
+# Maximum age in seconds of the in-process search and grid indexes used without FTS5 and R*Tree. They
+# only see commits made by their own process, so they are rebuilt once this old to pick up other workers' writes
+app.config.setdefault('DESTINATION_INDEX_MAX_AGE', 60)
+# Seconds between checks that the SQLite FTS5 and R*Tree index tables and their triggers still exist
+app.config.setdefault('DESTINATION_INDEX_CHECK_INTERVAL', 60)
+# Hot-object cache for GET /destination/<id>: maximum entries, TTLs in seconds for found and
+# not-found ids, and backend ('memory', or 'shared' to share one cache between the worker processes
+# on a host through the SQLite file at DESTINATION_OBJECT_CACHE_PATH, which 'shared' requires. Put it
+# in a directory only the service user can write, e.g. a 0700 directory under /dev/shm)
+app.config.setdefault('DESTINATION_OBJECT_CACHE_SIZE', 1024)
+app.config.setdefault('DESTINATION_OBJECT_CACHE_TTL', 60)
+app.config.setdefault('DESTINATION_OBJECT_CACHE_NEGATIVE_TTL', 5)
+app.config.setdefault('DESTINATION_OBJECT_CACHE_BACKEND', os.environ.get('DESTINATION_OBJECT_CACHE_BACKEND', 'memory'))
+app.config.setdefault('DESTINATION_OBJECT_CACHE_PATH', os.environ.get('DESTINATION_OBJECT_CACHE_PATH'))
+# JSON encoder used by the read endpoints ('json', 'orjson' or a callable returning bytes)
+app.config.setdefault('DESTINATION_JSON_ENCODER', 'json')
+# Requests slower than this many milliseconds are logged as warnings with their timing breakdown
+app.config.setdefault('SLOW_REQUEST_THRESHOLD_MS', float(os.environ.get('SLOW_REQUEST_THRESHOLD_MS', 500)))
+# Optional group commit for POST /destination: concurrent creates are queued and committed
+# together once the window elapses or the group reaches the maximum number of rows
+app.config.setdefault('DESTINATION_GROUP_COMMIT', os.environ.get('DESTINATION_GROUP_COMMIT') == '1')
+app.config.setdefault('DESTINATION_GROUP_COMMIT_WINDOW_MS', 5)
+app.config.setdefault('DESTINATION_GROUP_COMMIT_MAX_ROWS', 100)
+# Number of most common words stored per destination description
+app.config.setdefault('DESTINATION_ANALYTICS_TOP_WORDS', 3)
+
+# Engine profile. SQLite connections get WAL journaling and cache/mmap pragmas on connect;
+# server databases get an explicitly sized pool. DATABASE_REPLICA_URL, when set, serves GET routes
+app.config.setdefault('SQLITE_PRAGMAS', {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -64000)),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),
+})
+if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {
+        'pool_size': int(os.environ.get('DATABASE_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DATABASE_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.environ.get('DATABASE_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DATABASE_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': os.environ.get('DATABASE_POOL_PRE_PING', '1') == '1',
+    })
+if os.environ.get('DATABASE_REPLICA_URL'):
+    app.config.setdefault('SQLALCHEMY_BINDS', {})['replica'] = os.environ['DATABASE_REPLICA_URL']
+
+@event.listens_for(Engine, 'connect')
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma, value in app.config['SQLITE_PRAGMAS'].items():
+        cursor.execute(f'PRAGMA {pragma} = {value}')
+    cursor.close()
+
+# Session that sends reads made while handling GET/HEAD requests to the read-only replica
+class ReplicaRoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and 'replica' in db.engines
+                and has_request_context() and request.method in ('GET', 'HEAD')):
+            return db.engines['replica']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(app, session_options={'class_': ReplicaRoutingSession})
 ma = Marshmallow(app)
 
 # Define Destination database model and schema for serialization/deserialization
@@ -17,24 +123,837 @@ class Destination(db.Model):
     name = db.Column(db.String(100), unique=True, nullable=False)
     description = db.Column(db.Text, nullable=False)
     image_url = db.Column(db.String(200), nullable=True)
-    location = db.Column(db.String(100), nullable=True)
+    location = db.Column(db.String(100), nullable=True, index=True)
     contact = db.Column(db.String(100), nullable=True)
     website_url = db.Column(db.String(200), nullable=True)
     category = db.Column(db.String(100), nullable=True)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+
+    # category alone and category + location filters are both served by the composite index
+    __table_args__ = (db.Index('ix_destination_category_location', 'category', 'location'),)
+
+    analytics = db.relationship('DestinationAnalytics', uselist=False, cascade='all, delete-orphan')
 
     def __repr__(self):
         return f'<Destination {self.id}: {self.name}>'
 
+# Description metrics from Textanalytics, computed once when a description is written
+class DestinationAnalytics(db.Model):
+    destination_id = db.Column(db.Integer, db.ForeignKey('destination.id', ondelete='CASCADE'), primary_key=True)
+    word_count = db.Column(db.Integer, nullable=False)
+    sentence_count = db.Column(db.Integer, nullable=False)
+    average_sentence_length = db.Column(db.Float, nullable=False)
+    most_common_words = db.Column(db.JSON, nullable=False)
+
+    def __repr__(self):
+        return f'<DestinationAnalytics {self.destination_id}>'
+
+ANALYTICS_FIELDS = ('word_count', 'sentence_count', 'average_sentence_length', 'most_common_words')
+
+def describe_text(text):
+    return analyze(text, app.config['DESTINATION_ANALYTICS_TOP_WORDS'])
+
+# Catalogue-wide word frequencies, maintained with deltas on every destination write. scope is
+# '*' for the whole catalogue or 'category:<name>' for one category
+class DestinationWordCount(db.Model):
+    scope = db.Column(db.String(110), primary_key=True)
+    # Text rather than a bounded String: tokens have no length limit (a URL with its punctuation
+    # stripped is a single word) and an over-long one must not fail the destination write
+    word = db.Column(db.Text, primary_key=True)
+    count = db.Column(db.Integer, nullable=False)
+
+    # Top-N queries read one scope in count order straight from this index
+    __table_args__ = (db.Index('ix_destination_word_count_scope_count', 'scope', 'count'),)
+
+    def __repr__(self):
+        return f'<DestinationWordCount {self.scope} {self.word}: {self.count}>'
+
+ALL_WORDS_SCOPE = '*'
+
+def word_scopes(category):
+    return (ALL_WORDS_SCOPE,) if category is None else (ALL_WORDS_SCOPE, 'category:' + category)
+
+# Word counts with exactly the tokenization most_common_words uses
+def word_counts(text):
+    return Counter(dict(most_common_words(text or '', None)))
+
+# Add (sign=1) or remove (sign=-1) one description's words to a {(scope, word): delta} mapping
+def add_word_deltas(deltas, description, category, sign):
+    for word, count in word_counts(description).items():
+        for scope in word_scopes(category):
+            deltas[(scope, word)] += sign * count
+
 class DestinationSchema(ma.SQLAlchemySchema):
     class Meta:
         model = Destination
-        fields = ('id', 'name', 'description', 'image_url', 'location', 'contact', 'website_url', 'category')
+        load_instance = True
+        fields = ('id', 'name', 'description', 'image_url', 'location', 'contact', 'website_url', 'category',
+                  'latitude', 'longitude')
+
+    # Typed fields so a list or object where a string belongs fails validation for its own item
+    # instead of reaching the database or the analytics hook. name and description stay optional
+    # here; bulk paths check them in validate_destination_items
+    id = ma.Integer()
+    name = ma.String()
+    description = ma.String()
+    image_url = ma.String(allow_none=True)
+    location = ma.String(allow_none=True)
+    contact = ma.String(allow_none=True)
+    website_url = ma.String(allow_none=True)
+    category = ma.String(allow_none=True)
+    latitude = ma.Float(allow_none=True, validate=Range(-90, 90))
+    longitude = ma.Float(allow_none=True, validate=Range(-180, 180))
+
+# LRU cache of serialized GET responses with a TTL, shared by all threads of the process. It is
+# bounded by entry count and by the total size of the cached bodies; a body larger than
+# max_entry_bytes (an unpaginated list of a large catalogue, say) is never cached
+class ResponseCache:
+    def __init__(self, max_entries, ttl, max_bytes, max_entry_bytes):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] <= now:
+                self.remove(key)
+                entry = None
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, entry, generation):
+        size = len(entry[0])
+        with self.lock:
+            # Drop responses computed before the last invalidation, they may already be stale
+            if generation != self.generation or self.ttl <= 0 or size > min(self.max_entry_bytes, self.max_bytes):
+                return
+            self.remove(key)
+            self.entries[key] = (time.monotonic() + self.ttl, entry)
+            self.size += size
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                self.remove(next(iter(self.entries)))
+
+    # Callers hold the lock
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1][0])
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+            self.size = 0
+
+response_cache = ResponseCache(app.config['DESTINATION_RESPONSE_CACHE_SIZE'],
+                               app.config['DESTINATION_RESPONSE_CACHE_TTL'],
+                               app.config['DESTINATION_RESPONSE_CACHE_MAX_BYTES'],
+                               app.config['DESTINATION_RESPONSE_CACHE_MAX_ENTRY_BYTES'])
+
+# Invalidate cached responses whenever a transaction that wrote destinations commits,
+# so every write path (ORM flushes and bulk statements alike) is covered
+@event.listens_for(db.session, 'after_flush')
+def mark_destinations_changed(session, flush_context):
+    if any(isinstance(obj, Destination) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info['destinations_changed'] = True
+
+@event.listens_for(db.session, 'do_orm_execute')
+def mark_bulk_destinations_changed(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['destinations_changed'] = True
+
+@event.listens_for(db.session, 'after_commit')
+def invalidate_response_cache(session):
+    if session.info.pop('destinations_changed', False):
+        response_cache.clear()
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_destinations_changed(session):
+    session.info.pop('destinations_changed', None)
+
+# Hot-object cache for GET /destination/<id>: serialized destinations keyed by id with a TTL,
+# plus not-found ids (stored as None) with a shorter TTL so unknown ids skip the database too
+class ObjectCache:
+    def __init__(self, max_entries, ttl, negative_ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.entries = OrderedDict()
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.counters = Counter()
+
+    def current_generation(self):
+        return self.generation
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    # Returns (found, value); value is None for a cached not-found id
+    def get(self, key):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self.entries[key]
+                self.counters['expirations'] += 1
+                entry = None
+            if entry is None:
+                self.counters['misses'] += 1
+                return False, None
+            self.entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return True, entry[1]
+
+    def set(self, key, value, generation):
+        ttl = self.ttl if value is not None else self.negative_ttl
+        with self.lock:
+            # Drop values read before the last invalidation, they may already be stale
+            if generation != self.generation or ttl <= 0 or self.max_entries <= 0:
+                return
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def invalidate(self, keys):
+        with self.lock:
+            self.generation += 1
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+
+    def size(self):
+        return len(self.entries)
+
+    def render(self):
+        with self.lock:
+            counters = dict(self.counters)
+        lines = []
+        for name in ('hits', 'misses', 'evictions', 'expirations'):
+            lines += [f'# HELP destination_object_cache_{name}_total Hot-object cache {name}.',
+                      f'# TYPE destination_object_cache_{name}_total counter',
+                      f'destination_object_cache_{name}_total {counters.get(name, 0)}']
+        lines += ['# HELP destination_object_cache_entries Entries held by the hot-object cache.',
+                  '# TYPE destination_object_cache_entries gauge',
+                  f'destination_object_cache_entries {self.size()}']
+        return '\n'.join(lines) + '\n'
+
+# The same cache kept in a SQLite file on shared memory (/dev/shm) so every worker process on the host
+# shares entries and invalidations. The generation lives in the file as well, and writes are
+# conditional on it, so a worker can never store a value read before another worker's invalidation.
+# Recently used entries are refreshed at most once a second to keep hits read-only
+class SharedObjectCache(ObjectCache):
+    TOUCH_INTERVAL = 1.0
+
+    def __init__(self, path, max_entries, ttl, negative_ttl):
+        super().__init__(max_entries, ttl, negative_ttl)
+        self.path = path
+        self.local = threading.local()
+        with self.connection() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS object_cache '
+                               '(key INTEGER PRIMARY KEY, value TEXT, expires REAL NOT NULL, used REAL NOT NULL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS object_cache_used ON object_cache (used)')
+            connection.execute('CREATE TABLE IF NOT EXISTS object_cache_generation (generation INTEGER NOT NULL)')
+            connection.execute('INSERT INTO object_cache_generation SELECT 0 '
+                               'WHERE NOT EXISTS (SELECT 1 FROM object_cache_generation)')
+
+    def connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = OFF')
+            self.local.connection = connection
+        return connection
+
+    def current_generation(self):
+        return self.connection().execute('SELECT generation FROM object_cache_generation').fetchone()[0]
+
+    def get(self, key):
+        now = time.time()
+        connection = self.connection()
+        entry = connection.execute('SELECT value, expires, used FROM object_cache WHERE key = ?', (key,)).fetchone()
+        if entry is not None and entry[1] <= now:
+            with connection:
+                connection.execute('DELETE FROM object_cache WHERE key = ? AND expires <= ?', (key, now))
+            self.count('expirations')
+            entry = None
+        if entry is None:
+            self.count('misses')
+            return False, None
+        if now - entry[2] > self.TOUCH_INTERVAL:
+            with connection:
+                connection.execute('UPDATE object_cache SET used = ? WHERE key = ?', (now, key))
+        self.count('hits')
+        return True, json.loads(entry[0]) if entry[0] is not None else None
+
+    def set(self, key, value, generation):
+        ttl = self.ttl if value is not None else self.negative_ttl
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        now = time.time()
+        with self.connection() as connection:
+            stored = connection.execute(
+                'INSERT OR REPLACE INTO object_cache SELECT ?, ?, ?, ? '
+                'WHERE (SELECT generation FROM object_cache_generation) = ?',
+                (key, json.dumps(value) if value is not None else None, now + ttl, now, generation)).rowcount
+            if not stored:
+                return
+            evicted = connection.execute(
+                'DELETE FROM object_cache WHERE key IN (SELECT key FROM object_cache ORDER BY used '
+                'LIMIT max(0, (SELECT count(*) FROM object_cache) - ?))', (self.max_entries,)).rowcount
+        if evicted:
+            self.count('evictions', evicted)
+
+    def invalidate(self, keys):
+        keys = list(keys)
+        with self.connection() as connection:
+            connection.execute('UPDATE object_cache_generation SET generation = generation + 1')
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                connection.execute(f"DELETE FROM object_cache WHERE key IN ({', '.join('?' * len(chunk))})", chunk)
+
+    def clear(self):
+        with self.connection() as connection:
+            connection.execute('UPDATE object_cache_generation SET generation = generation + 1')
+            connection.execute('DELETE FROM object_cache')
+
+    def size(self):
+        return self.connection().execute('SELECT count(*) FROM object_cache').fetchone()[0]
+
+object_cache_state = {'cache': None}
+
+# Build the configured hot-object cache on first use
+def get_object_cache():
+    if object_cache_state['cache'] is not None:
+        return object_cache_state['cache']
+    options = (app.config['DESTINATION_OBJECT_CACHE_SIZE'], app.config['DESTINATION_OBJECT_CACHE_TTL'],
+               app.config['DESTINATION_OBJECT_CACHE_NEGATIVE_TTL'])
+    if app.config['DESTINATION_OBJECT_CACHE_BACKEND'] == 'shared':
+        # No default location: a predictable file in a world-writable directory would let any local
+        # user plant cached bodies, and unrelated deployments on one host would share it
+        path = app.config['DESTINATION_OBJECT_CACHE_PATH']
+        if not path:
+            raise RuntimeError('DESTINATION_OBJECT_CACHE_PATH must be set for the shared object cache.')
+        cache = SharedObjectCache(path, *options)
+    else:
+        cache = ObjectCache(*options)
+    object_cache_state['cache'] = cache
+    return cache
+
+# Drop cached objects for destinations written by a committed transaction. Bulk statements
+# don't say which rows they touched, so any that target the destination table clear the cache
+@event.listens_for(db.session, 'after_flush')
+def track_object_cache_changes(session, flush_context):
+    changed = session.info.setdefault('object_cache_ids', set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Destination):
+            changed.add(obj.id)
+
+@event.listens_for(db.session, 'do_orm_execute')
+def track_bulk_object_cache_changes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is None or mapper.class_ is Destination:
+            orm_execute_state.session.info['object_cache_stale'] = True
+
+@event.listens_for(db.session, 'after_commit')
+def invalidate_object_cache(session):
+    changed = session.info.pop('object_cache_ids', None)
+    if session.info.pop('object_cache_stale', False):
+        get_object_cache().clear()
+    elif changed:
+        get_object_cache().invalidate(changed)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_object_cache_changes(session):
+    session.info.pop('object_cache_ids', None)
+    session.info.pop('object_cache_stale', None)
+
+# Keep analytics in step with ORM writes: recompute whenever a description is created or changed
+@event.listens_for(db.session, 'before_flush')
+def compute_destination_analytics(session, flush_context, instances):
+    for obj in (*session.new, *session.dirty):
+        if not isinstance(obj, Destination) or obj.description is None:
+            continue
+        if obj not in session.new and not attributes.get_history(obj, 'description').has_changes():
+            continue
+        metrics = describe_text(obj.description)
+        if obj.analytics is None:
+            obj.analytics = DestinationAnalytics(**metrics)
+        else:
+            for field, value in metrics.items():
+                setattr(obj.analytics, field, value)
+
+# Nearest-destination queries. On SQLite coordinates are indexed in an R*Tree virtual table kept in
+# sync by triggers; elsewhere an in-process grid of fixed-size cells is maintained from session events
+EARTH_RADIUS_KM = 6371.0088
+RTREE_TABLE = 'destination_rtree'
+RTREE_DDL = f"CREATE VIRTUAL TABLE IF NOT EXISTS {RTREE_TABLE} USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+RTREE_TRIGGERS = {
+    f'{RTREE_TABLE}_insert':
+        f"CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_insert AFTER INSERT ON destination "
+        f"WHEN new.latitude IS NOT NULL AND new.longitude IS NOT NULL BEGIN "
+        f"INSERT INTO {RTREE_TABLE} VALUES (new.id, new.latitude, new.latitude, new.longitude, new.longitude); END",
+    f'{RTREE_TABLE}_update':
+        f"CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_update AFTER UPDATE OF latitude, longitude ON destination BEGIN "
+        f"DELETE FROM {RTREE_TABLE} WHERE id = old.id; "
+        f"INSERT INTO {RTREE_TABLE} SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude "
+        f"WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL; END",
+    f'{RTREE_TABLE}_delete':
+        f"CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_delete AFTER DELETE ON destination BEGIN "
+        f"DELETE FROM {RTREE_TABLE} WHERE id = old.id; END",
+}
+RTREE_REBUILD = (
+    f"DELETE FROM {RTREE_TABLE}",
+    f"INSERT INTO {RTREE_TABLE} SELECT id, latitude, latitude, longitude, longitude FROM destination "
+    f"WHERE latitude IS NOT NULL AND longitude IS NOT NULL",
+)
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1, math.sqrt(a)))
+
+# Latitude/longitude boxes covering a circle, split at the antimeridian and widened over the poles
+def bounding_boxes(lat, lon, radius_km):
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - delta_lat, lat + delta_lat
+    if min_lat <= -90 or max_lat >= 90 or math.cos(math.radians(lat)) < 1e-9:
+        return [(max(min_lat, -90), min(max_lat, 90), -180, 180)]
+    delta_lon = math.degrees(math.asin(min(1, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat)))))
+    min_lon, max_lon = lon - delta_lon, lon + delta_lon
+    if delta_lon >= 180:
+        return [(min_lat, max_lat, -180, 180)]
+    if min_lon < -180:
+        return [(min_lat, max_lat, -180, max_lon), (min_lat, max_lat, min_lon + 360, 180)]
+    if max_lon > 180:
+        return [(min_lat, max_lat, min_lon, 180), (min_lat, max_lat, -180, max_lon - 360)]
+    return [(min_lat, max_lat, min_lon, max_lon)]
+
+class GridIndex:
+    def __init__(self, cell_degrees=0.5):
+        self.cell_degrees = cell_degrees
+        self.cells = {}
+        self.points = {}
+        self.ready = False
+        self.built = 0
+        self.lock = threading.RLock()
+
+    def cell(self, lat, lon):
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lon / self.cell_degrees))
+
+    def add(self, destination_id, lat, lon):
+        with self.lock:
+            self.remove(destination_id)
+            if lat is None or lon is None:
+                return
+            self.points[destination_id] = (lat, lon)
+            self.cells.setdefault(self.cell(lat, lon), {})[destination_id] = (lat, lon)
+
+    def remove(self, destination_id):
+        with self.lock:
+            point = self.points.pop(destination_id, None)
+            if point is not None:
+                cell = self.cells[self.cell(*point)]
+                del cell[destination_id]
+                if not cell:
+                    del self.cells[self.cell(*point)]
+
+    def rebuild(self, rows):
+        with self.lock:
+            self.cells, self.points = {}, {}
+            for destination_id, lat, lon in rows:
+                self.add(destination_id, lat, lon)
+            self.ready = True
+            self.built = time.monotonic()
+
+    # Same rule as InvertedIndex.stale: other processes' commits only arrive through a rebuild
+    def stale(self, max_age):
+        return not self.ready or time.monotonic() - self.built > max_age
+
+    def candidates(self, boxes):
+        with self.lock:
+            for min_lat, max_lat, min_lon, max_lon in boxes:
+                low, high = self.cell(min_lat, min_lon), self.cell(max_lat, max_lon)
+                if (high[0] - low[0] + 1) * (high[1] - low[1] + 1) > len(self.cells):
+                    # The box spans more cells than are occupied: walk the occupied ones instead
+                    cells = [cell for key, cell in self.cells.items()
+                             if low[0] <= key[0] <= high[0] and low[1] <= key[1] <= high[1]]
+                else:
+                    cells = [self.cells.get((i, j)) for i in range(low[0], high[0] + 1)
+                             for j in range(low[1], high[1] + 1)]
+                for cell in cells:
+                    for destination_id, (lat, lon) in (cell or {}).items():
+                        if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon:
+                            yield destination_id, lat, lon
+
+geo_index = GridIndex()
+geo_state = {'backend': None, 'checked': 0}
+
+# Pick the geo backend, creating and populating the R*Tree table and its triggers if missing.
+# The choice is re-checked every DESTINATION_INDEX_CHECK_INTERVAL seconds, as for search
+def get_geo_backend():
+    if (geo_state['backend'] is not None
+            and time.monotonic() - geo_state['checked'] < app.config['DESTINATION_INDEX_CHECK_INTERVAL']):
+        return geo_state['backend']
+    backend = 'memory'
+    if db.engine.dialect.name == 'sqlite':
+        try:
+            ensure_sqlite_index(RTREE_TABLE, RTREE_DDL, RTREE_TRIGGERS, RTREE_REBUILD)
+            backend = 'rtree'
+        except OperationalError:
+            # SQLite built without R*Tree: fall back to the in-process grid
+            pass
+    geo_state.update(backend=backend, checked=time.monotonic())
+    return backend
+
+# Ids within radius_km of (lat, lon), nearest first, as (distance_km, id) pairs
+def nearby_destination_ids(lat, lon, radius_km, limit):
+    boxes = bounding_boxes(lat, lon, radius_km)
+    if get_geo_backend() == 'rtree':
+        rtree = text(f"SELECT d.id, d.latitude, d.longitude FROM {RTREE_TABLE} r JOIN destination d ON d.id = r.id "
+                     f"WHERE r.max_lat >= :min_lat AND r.min_lat <= :max_lat "
+                     f"AND r.max_lon >= :min_lon AND r.min_lon <= :max_lon")
+        candidates = [row for min_lat, max_lat, min_lon, max_lon in boxes for row in db.session.execute(
+            rtree, {'min_lat': min_lat, 'max_lat': max_lat, 'min_lon': min_lon, 'max_lon': max_lon})]
+    else:
+        if geo_index.stale(app.config['DESTINATION_INDEX_MAX_AGE']):
+            geo_index.rebuild(db.session.query(Destination.id, Destination.latitude, Destination.longitude)
+                              .filter(Destination.latitude.isnot(None), Destination.longitude.isnot(None))
+                              .yield_per(1000))
+        candidates = list(geo_index.candidates(boxes))
+    distances = ((haversine_km(lat, lon, point_lat, point_lon), destination_id)
+                 for destination_id, point_lat, point_lon in candidates)
+    return heapq.nsmallest(limit, (pair for pair in distances if pair[0] <= radius_km))
+
+@event.listens_for(db.session, 'after_flush')
+def track_geo_changes(session, flush_context):
+    changes = session.info.setdefault('geo_changes', {})
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, Destination):
+            changes[obj.id] = (obj.latitude, obj.longitude)
+    for obj in session.deleted:
+        if isinstance(obj, Destination):
+            changes[obj.id] = (None, None)
+
+@event.listens_for(db.session, 'do_orm_execute')
+def track_bulk_geo_changes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['geo_index_stale'] = True
+
+@event.listens_for(db.session, 'after_commit')
+def apply_geo_changes(session):
+    changes = session.info.pop('geo_changes', {})
+    if session.info.pop('geo_index_stale', False):
+        geo_index.ready = False
+    if not geo_index.ready:
+        return
+    for destination_id, (lat, lon) in changes.items():
+        geo_index.add(destination_id, lat, lon)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_geo_changes(session):
+    session.info.pop('geo_changes', None)
+    session.info.pop('geo_index_stale', None)
+
+# Collect word-count deltas for ORM writes before the flush, while old values are still in the
+# attribute history, and apply them in the same transaction once the flush has run
+@event.listens_for(db.session, 'before_flush')
+def collect_word_deltas(session, flush_context, instances):
+    deltas = session.info.setdefault('word_deltas', Counter())
+    for obj in session.new:
+        if isinstance(obj, Destination):
+            add_word_deltas(deltas, obj.description, obj.category, 1)
+    for obj in session.dirty:
+        if not isinstance(obj, Destination):
+            continue
+        description = attributes.get_history(obj, 'description')
+        category = attributes.get_history(obj, 'category')
+        if not description.has_changes() and not category.has_changes():
+            continue
+        old_description = description.deleted[0] if description.deleted else obj.description
+        old_category = category.deleted[0] if category.deleted else obj.category
+        add_word_deltas(deltas, old_description, old_category, -1)
+        add_word_deltas(deltas, obj.description, obj.category, 1)
+    for obj in session.deleted:
+        if isinstance(obj, Destination):
+            add_word_deltas(deltas, obj.description, obj.category, -1)
+
+@event.listens_for(db.session, 'after_flush')
+def apply_collected_word_deltas(session, flush_context):
+    apply_word_deltas(session.connection(), session.info.pop('word_deltas', {}))
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_word_deltas(session):
+    session.info.pop('word_deltas', None)
+
+# Rows per word-count upsert, keeping each statement well under the bound-parameter limits
+# (32766 on SQLite, 65535 on PostgreSQL) however many words a flush touches
+WORD_DELTA_CHUNK_SIZE = 1000
+
+# Add deltas to the stored word counts with one INSERT ... ON CONFLICT DO UPDATE per chunk
+def apply_word_deltas(connection, deltas):
+    values = [{'scope': scope, 'word': word, 'count': delta}
+              for (scope, word), delta in deltas.items() if delta]
+    if not values:
+        return
+    table = DestinationWordCount.__table__
+    insert = UPSERT_DIALECTS.get(connection.dialect.name)
+    if insert is None:
+        for value in values:
+            updated = connection.execute(table.update()
+                                         .where(table.c.scope == value['scope'], table.c.word == value['word'])
+                                         .values(count=table.c.count + value['count']))
+            if not updated.rowcount:
+                connection.execute(table.insert().values(value))
+        return
+    for start in range(0, len(values), WORD_DELTA_CHUNK_SIZE):
+        statement = insert(table).values(values[start:start + WORD_DELTA_CHUNK_SIZE])
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=['scope', 'word'], set_={'count': table.c.count + statement.excluded.count}))
+
+# Store analytics for rows written with Core statements (upserts, backfill), one statement per call.
+# The statement runs on the connection so the session's bulk-write hooks don't see it
+def save_destination_analytics(rows):
+    values = [{'destination_id': destination_id, **describe_text(description)} for destination_id, description in rows]
+    if not values:
+        return
+    connection = db.session.connection()
+    insert = UPSERT_DIALECTS.get(connection.dialect.name)
+    if insert is None:
+        for value in values:
+            db.session.merge(DestinationAnalytics(**value))
+        return
+    statement = insert(DestinationAnalytics.__table__).values(values)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=['destination_id'],
+        set_={field: statement.excluded[field] for field in ANALYTICS_FIELDS}))
+
+# Serve successful GET responses from the response cache with a strong ETag,
+# answering If-None-Match with 304 so unchanged bodies are never resent
+def cached_response(view):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        entry = response_cache.get(key)
+        if entry is None:
+            generation = response_cache.generation
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            body = response.get_data()
+            entry = (body, response.mimetype, hashlib.blake2b(body, digest_size=16).hexdigest())
+            response_cache.set(key, entry, generation)
+        body, mimetype, etag = entry
+        response = Response(body, status=200, mimetype=mimetype)
+        response.set_etag(etag)
+        return response.make_conditional(request)
+    return wrapper
+
+# In-process inverted index over destination name and description with BM25 ranking,
+# used for full-text search when the database has no FTS5 support
+class InvertedIndex:
+    TOKEN_PATTERN = re.compile(r'\w+')
+
+    def __init__(self):
+        self.postings = {}
+        self.terms = {}
+        self.lengths = {}
+        self.total_length = 0
+        self.ready = False
+        self.built = 0
+        self.lock = threading.RLock()
+
+    @classmethod
+    def tokenize(cls, text):
+        return cls.TOKEN_PATTERN.findall((text or '').lower())
+
+    def add(self, destination_id, name, description):
+        with self.lock:
+            self.remove(destination_id)
+            tokens = self.tokenize(name) + self.tokenize(description)
+            for token in tokens:
+                postings = self.postings.setdefault(token, {})
+                postings[destination_id] = postings.get(destination_id, 0) + 1
+            self.terms[destination_id] = set(tokens)
+            self.lengths[destination_id] = len(tokens)
+            self.total_length += len(tokens)
+
+    def remove(self, destination_id):
+        with self.lock:
+            length = self.lengths.pop(destination_id, None)
+            if length is None:
+                return
+            self.total_length -= length
+            for token in self.terms.pop(destination_id):
+                del self.postings[token][destination_id]
+                if not self.postings[token]:
+                    del self.postings[token]
+
+    def rebuild(self, rows):
+        with self.lock:
+            self.postings, self.terms, self.lengths, self.total_length = {}, {}, {}, 0
+            for destination_id, name, description in rows:
+                self.add(destination_id, name, description)
+            self.ready = True
+            self.built = time.monotonic()
+
+    # True when the index must be rebuilt: it was never built, a bulk write invalidated it, or it
+    # is older than max_age seconds and may be missing writes committed by other processes
+    def stale(self, max_age):
+        return not self.ready or time.monotonic() - self.built > max_age
+
+    # Return ids of destinations containing every query token, best BM25 score first
+    def search(self, query, limit, offset=0, k1=1.2, b=0.75):
+        with self.lock:
+            tokens = set(self.tokenize(query))
+            if not tokens or any(token not in self.postings for token in tokens):
+                return []
+            postings = sorted((self.postings[token] for token in tokens), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+            document_count = len(self.lengths)
+            average_length = self.total_length / document_count
+            scores = {}
+            for token_postings in postings:
+                idf = math.log(1 + (document_count - len(token_postings) + 0.5) / (len(token_postings) + 0.5))
+                for destination_id in candidates:
+                    frequency = token_postings[destination_id]
+                    norm = k1 * (1 - b + b * self.lengths[destination_id] / average_length)
+                    scores[destination_id] = scores.get(destination_id, 0) + idf * frequency * (k1 + 1) / (frequency + norm)
+            best = heapq.nlargest(offset + limit, scores, key=lambda destination_id: (scores[destination_id], -destination_id))
+            return best[offset:]
+
+search_index = InvertedIndex()
+
+# Create a trigger-maintained SQLite index table if it is missing, and any of its triggers that are
+# missing: they are dropped along with the destination table, when it is recreated or rebuilt by a
+# migration. The index is repopulated whenever the table or a trigger had to be created
+def ensure_sqlite_index(table, ddl, triggers, rebuild):
+    with db.engine.begin() as connection:
+        existing = {name for (name,) in connection.execute(text("SELECT name FROM sqlite_master"))}
+        missing = [name for name in triggers if name not in existing]
+        if table not in existing:
+            connection.execute(text(ddl))
+        for name in missing:
+            connection.execute(text(triggers[name]))
+        if table not in existing or missing:
+            for statement in rebuild:
+                connection.execute(text(statement))
+
+# On SQLite the search index is an FTS5 external-content table kept in sync by triggers,
+# so every write path (including bulk statements) updates it inside the same transaction
+FTS_TABLE = 'destination_fts'
+FTS_DDL = (f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+           f"USING fts5(name, description, content='destination', content_rowid='id')")
+FTS_TRIGGERS = {
+    f'{FTS_TABLE}_insert':
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON destination BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    f'{FTS_TABLE}_delete':
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON destination BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+        f"VALUES ('delete', old.id, old.name, old.description); END",
+    f'{FTS_TABLE}_update':
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF name, description ON destination BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+        f"VALUES ('delete', old.id, old.name, old.description); "
+        f"INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+}
+FTS_REBUILD = (f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",)
+search_state = {'backend': None, 'checked': 0}
+
+# Pick the search backend, creating and populating the FTS5 table and its triggers if missing.
+# The choice is re-checked every DESTINATION_INDEX_CHECK_INTERVAL seconds
+def get_search_backend():
+    if (search_state['backend'] is not None
+            and time.monotonic() - search_state['checked'] < app.config['DESTINATION_INDEX_CHECK_INTERVAL']):
+        return search_state['backend']
+    backend = 'memory'
+    if db.engine.dialect.name == 'sqlite':
+        try:
+            ensure_sqlite_index(FTS_TABLE, FTS_DDL, FTS_TRIGGERS, FTS_REBUILD)
+            backend = 'fts5'
+        except OperationalError:
+            # SQLite built without FTS5: fall back to the in-process index
+            pass
+    search_state.update(backend=backend, checked=time.monotonic())
+    return backend
+
+# Quote every term so user input is matched literally instead of parsed as FTS5 query syntax
+def fts_match_expression(query):
+    return ' '.join('"' + token.replace('"', '""') + '"' for token in query.split())
+
+def search_destination_ids(query, limit, offset):
+    if get_search_backend() == 'fts5':
+        rows = db.session.execute(
+            text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match "
+                 f"ORDER BY bm25({FTS_TABLE}), rowid LIMIT :limit OFFSET :offset"),
+            {'match': fts_match_expression(query), 'limit': limit, 'offset': offset})
+        return [row[0] for row in rows]
+    if search_index.stale(app.config['DESTINATION_INDEX_MAX_AGE']):
+        search_index.rebuild(db.session.query(Destination.id, Destination.name, Destination.description)
+                             .yield_per(1000))
+    return search_index.search(query, limit, offset)
+
+# Keep the in-process index in step with committed changes; bulk statements mark it for rebuild
+@event.listens_for(db.session, 'after_flush')
+def track_search_changes(session, flush_context):
+    changes = session.info.setdefault('search_changes', {})
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, Destination):
+            changes[obj.id] = (obj.name, obj.description)
+    for obj in session.deleted:
+        if isinstance(obj, Destination):
+            changes[obj.id] = None
+
+@event.listens_for(db.session, 'do_orm_execute')
+def track_bulk_search_changes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['search_index_stale'] = True
+
+@event.listens_for(db.session, 'after_commit')
+def apply_search_changes(session):
+    changes = session.info.pop('search_changes', {})
+    if session.info.pop('search_index_stale', False):
+        search_index.ready = False
+    if not search_index.ready:
+        return
+    for destination_id, fields in changes.items():
+        if fields is None:
+            search_index.remove(destination_id)
+        else:
+            search_index.add(destination_id, *fields)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_search_changes(session):
+    session.info.pop('search_changes', None)
+    session.info.pop('search_index_stale', None)
 
 # Define endpoints for creating and retrieving cultural destinations
 @app.route('/destination', methods=['POST'])
 def create_destination():
     destination_data = request.get_json()
     destination_schema = DestinationSchema()
+    if app.config['DESTINATION_GROUP_COMMIT']:
+        return create_destination_grouped(destination_data, destination_schema)
     try:
         # Deserialize and validate destination data from request
         destination = destination_schema.load(destination_data, session=db.session)
@@ -53,22 +972,904 @@ def create_destination():
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
+@app.route('/destination/by-name/<name>', methods=['PUT'])
+def upsert_destination(name):
+    destination_data = request.get_json(silent=True)
+    if not isinstance(destination_data, dict):
+        return jsonify({'error': 'Request body must be a JSON object.'}), 400
+    if destination_data.setdefault('name', name) != name:
+        return jsonify({'error': 'Destination name in the body does not match the URL.'}), 400
+    if_exists = request.args.get('if_exists', 'update')
+    if if_exists not in ('update', 'ignore'):
+        return jsonify({'error': 'if_exists must be update or ignore.'}), 400
+    result = upsert_destinations([destination_data], if_exists)[0]
+    if result['status'] == 400:
+        return jsonify({'error': result['error']}), 400
+    if result['result'] == 'unchanged':
+        # The stored row is returned as is, it may differ from the payload when if_exists=ignore
+        columns, serialize = row_serializer()
+        destination = serialize(db.session.execute(select(*columns).where(Destination.name == name)).first())
+    else:
+        destination = {'id': result['id'], **upsert_values(destination_data)}
+    return jsonify({'result': result['result'], 'destination': destination}), result['status']
+
+@app.route('/destination/by-name', methods=['PUT'])
+def upsert_destinations_batch():
+    destination_data = request.get_json(silent=True)
+    if not isinstance(destination_data, list):
+        return jsonify({'error': 'Request body must be a JSON array of destinations.'}), 400
+    max_items = app.config['DESTINATION_BATCH_MAX_ITEMS']
+    if len(destination_data) > max_items:
+        return jsonify({'error': f'A batch may contain at most {max_items} destinations.'}), 400
+    if_exists = request.args.get('if_exists', 'update')
+    if if_exists not in ('update', 'ignore'):
+        return jsonify({'error': 'if_exists must be update or ignore.'}), 400
+
+    results = upsert_destinations(destination_data, if_exists)
+    counts = {outcome: sum(1 for result in results if result.get('result') == outcome)
+              for outcome in ('created', 'updated', 'unchanged')}
+    failed = sum(1 for result in results if result['status'] == 400)
+    return jsonify({**counts, 'failed': failed, 'results': results}), 207 if failed else 200
+
+# Validate in the request thread, then hand the row to the group committer and wait for
+# this row's own outcome; responses are identical to the one-commit-per-request path
+def create_destination_grouped(destination_data, destination_schema):
+    try:
+        errors = destination_schema.validate(destination_data, session=db.session)
+        if errors:
+            raise ValidationError(errors)
+        if destination_data.get('name') is None or destination_data.get('description') is None:
+            # The plain path reports the NOT NULL violation through its IntegrityError handler;
+            # answer the same here rather than queue a row that cannot be written
+            return jsonify({'error': 'Destination name must be unique.'}), 400
+        result = group_committer.submit(destination_data)
+    except Exception as e:
+        # Handle any other error
+        return jsonify({'error': str(e)}), 400
+    if result['status'] != 201:
+        return jsonify({'error': result['error']}), 400
+    destination = Destination(**dict(destination_data, id=result['id']))
+    return jsonify(destination_schema.dump(destination)), 201
+
+# Background writer that coalesces queued creates into one transaction per group
+class GroupCommitter:
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def submit(self, item):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='destination-group-commit', daemon=True)
+                self.thread.start()
+        future = Future()
+        self.queue.put((item, future))
+        return future.result()
+
+    def next_group(self):
+        group = [self.queue.get()]
+        deadline = time.monotonic() + app.config['DESTINATION_GROUP_COMMIT_WINDOW_MS'] / 1000
+        while len(group) < app.config['DESTINATION_GROUP_COMMIT_MAX_ROWS']:
+            try:
+                group.append(self.queue.get(timeout=max(0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        return group
+
+    def run(self):
+        while True:
+            group = self.next_group()
+            items = [item for item, _ in group]
+            with app.app_context():
+                try:
+                    results = commit_destination_group(items)
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception('Committing a group of %d destinations failed', len(items))
+                    results = [{'status': 400, 'error': DESTINATION_WRITE_ERROR}] * len(items)
+                finally:
+                    db.session.remove()
+            for (_, future), result in zip(group, results):
+                future.set_result(result)
+
+def commit_destination_group(items):
+    results = [None] * len(items)
+    pending = []
+    seen_names = set()
+    for index, item in enumerate(items):
+        # The first request for a name in the group wins, exactly as if it had committed first
+        if item.get('name') in seen_names:
+            results[index] = {'index': index, 'status': 400, 'error': 'Destination name must be unique.'}
+        else:
+            seen_names.add(item.get('name'))
+            pending.append(index)
+    # A failure only reaches the request that caused it
+    insert_destination_rows(items, pending, results)
+    return results
+
+group_committer = GroupCommitter()
+
+@app.route('/destination/batch', methods=['POST'])
+def create_destinations_batch():
+    destination_data = request.get_json(silent=True)
+    if not isinstance(destination_data, list):
+        return jsonify({'error': 'Request body must be a JSON array of destinations.'}), 400
+    max_items = app.config['DESTINATION_BATCH_MAX_ITEMS']
+    if len(destination_data) > max_items:
+        return jsonify({'error': f'A batch may contain at most {max_items} destinations.'}), 400
+
+    results = create_destinations(destination_data)
+    created = sum(1 for result in results if result['status'] == 201)
+    status = 201 if created == len(results) else 207
+    return jsonify({'created': created, 'failed': len(results) - created, 'results': results}), status
+
+# Error reported for items whose write failed for a reason other than validation or a duplicate name
+DESTINATION_WRITE_ERROR = 'Destination could not be saved.'
+
+# Validate and insert many destinations in chunked transactions, returning one result per item.
+# Invalid items and duplicate names are reported without failing the rest of the items
+def create_destinations(items):
+    results, pending = validate_destination_items(items)
+    chunk_size = app.config['DESTINATION_BATCH_CHUNK_SIZE']
+    for start in range(0, len(pending), chunk_size):
+        insert_destination_rows(items, pending[start:start + chunk_size], results)
+    return results
+
+# Insert one chunk, retrying it row by row if it fails so only the offending items fail. The
+# exception text can carry the whole statement and its parameters, so it is logged rather than
+# copied into the results
+def insert_destination_rows(items, indexes, results):
+    try:
+        insert_destination_chunk(items, indexes, results)
+    except Exception:
+        db.session.rollback()
+        for index in indexes:
+            results[index] = None
+            try:
+                insert_destination_chunk(items, [index], results)
+            except Exception:
+                db.session.rollback()
+                app.logger.exception('Inserting destination %r failed', items[index].get('name'))
+                results[index] = {'index': index, 'status': 400, 'error': DESTINATION_WRITE_ERROR}
+
+# Validate all items at once with the schema, then check required fields and in-batch duplicates.
+# Returns the results list with failures filled in and the indexes of the items still pending
+def validate_destination_items(items):
+    destination_schema = DestinationSchema(many=True)
+    errors = destination_schema.validate(items, session=db.session)
+    results = [None] * len(items)
+    pending = []
+    seen_names = set()
+    for index, item in enumerate(items):
+        missing = [field for field in ('name', 'description') if index not in errors and not item.get(field)]
+        if index in errors:
+            results[index] = {'index': index, 'status': 400, 'error': errors[index]}
+        elif missing:
+            error = {field: ['Missing data for required field.'] for field in missing}
+            results[index] = {'index': index, 'status': 400, 'error': error}
+        elif item['name'] in seen_names:
+            results[index] = {'index': index, 'status': 400, 'error': 'Destination name must be unique.'}
+        else:
+            seen_names.add(item['name'])
+            pending.append(index)
+    return results, pending
+
+# Create or update destinations by name. Rows whose stored values already equal the payload are
+# reported unchanged without any write; the rest go through one native INSERT ... ON CONFLICT(name)
+# per chunk (DO UPDATE, or DO NOTHING when if_exists='ignore') instead of failing and rolling back
+UPSERT_FIELDS = tuple(field for field in DestinationSchema.Meta.fields if field != 'id')
+UPSERT_DIALECTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+# Column values of a validated item as the schema deserializes them, so a payload latitude of
+# "26.9" is written, and compared with the stored row, as the float 26.9
+def upsert_values(item, schema_fields=None):
+    schema_fields = schema_fields or DestinationSchema().fields
+    return {field: schema_fields[field].deserialize(item.get(field)) for field in UPSERT_FIELDS}
+
+def upsert_destinations(items, if_exists='update'):
+    results, pending = validate_destination_items(items)
+    chunk_size = app.config['DESTINATION_BATCH_CHUNK_SIZE']
+    for start in range(0, len(pending), chunk_size):
+        indexes = pending[start:start + chunk_size]
+        try:
+            upsert_destination_chunk(items, indexes, results, if_exists)
+        except Exception:
+            # Handle any other error for this chunk only, logging it as create_destinations does
+            db.session.rollback()
+            app.logger.exception('Upserting a chunk of %d destinations failed', len(indexes))
+            for index in indexes:
+                results[index] = {'index': index, 'status': 400, 'error': DESTINATION_WRITE_ERROR}
+    return results
+
+def upsert_destination_chunk(items, indexes, results, if_exists):
+    names = [items[index]['name'] for index in indexes]
+    stored = {row.name: row for row in db.session.execute(
+        select(Destination.id, *[getattr(Destination, field) for field in UPSERT_FIELDS])
+        .where(Destination.name.in_(names)))}
+    writes = []
+    schema_fields = DestinationSchema().fields
+    for index in indexes:
+        values = upsert_values(items[index], schema_fields)
+        row = stored.get(values['name'])
+        if row is not None and (if_exists == 'ignore' or all(getattr(row, f) == values[f] for f in UPSERT_FIELDS)):
+            results[index] = {'index': index, 'status': 200, 'result': 'unchanged', 'id': row.id, 'name': row.name}
+        else:
+            writes.append((index, values, 'updated' if row is not None else 'created'))
+    if not writes:
+        return
+
+    # Statements run on the connection, not through the session, so the bulk-write hooks don't mark
+    # the search and geo indexes for a rebuild or clear the object cache; the written rows are known
+    # and recorded below instead
+    table = Destination.__table__
+    connection = db.session.connection()
+    insert = UPSERT_DIALECTS.get(connection.dialect.name)
+    if insert is None:
+        # No native upsert on this database: write row by row
+        returned = {}
+        for index, values, outcome in writes:
+            if outcome == 'created':
+                returned[values['name']] = connection.execute(table.insert().values(values)).inserted_primary_key[0]
+            else:
+                connection.execute(table.update().where(table.c.name == values['name']).values(values))
+                returned[values['name']] = stored[values['name']].id
+    else:
+        statement = insert(table).values([values for _, values, _ in writes])
+        if if_exists == 'ignore':
+            statement = statement.on_conflict_do_nothing(index_elements=['name'])
+        else:
+            # The WHERE keeps a concurrent identical write from turning into a redundant update
+            statement = statement.on_conflict_do_update(
+                index_elements=['name'],
+                set_={field: statement.excluded[field] for field in UPSERT_FIELDS},
+                where=or_(*[table.c[field].is_distinct_from(statement.excluded[field]) for field in UPSERT_FIELDS]))
+        returned = dict((name, destination_id) for destination_id, name in connection.execute(
+            statement.returning(table.c.id, table.c.name)))
+    save_destination_analytics([(returned[values['name']], values['description'])
+                                for _, values, _ in writes if values['name'] in returned])
+    # Core writes bypass the flush hooks, so word-count deltas are derived from the pre-read rows
+    # and the caches and in-process indexes are told exactly which rows changed
+    deltas = Counter()
+    search_changes = db.session.info.setdefault('search_changes', {})
+    geo_changes = db.session.info.setdefault('geo_changes', {})
+    object_cache_ids = db.session.info.setdefault('object_cache_ids', set())
+    for _, values, outcome in writes:
+        if values['name'] not in returned:
+            continue
+        if outcome == 'updated':
+            old = stored[values['name']]
+            add_word_deltas(deltas, old.description, old.category, -1)
+        add_word_deltas(deltas, values['description'], values['category'], 1)
+        destination_id = returned[values['name']]
+        search_changes[destination_id] = (values['name'], values['description'])
+        geo_changes[destination_id] = (values['latitude'], values['longitude'])
+        object_cache_ids.add(destination_id)
+    if returned:
+        db.session.info['destinations_changed'] = True
+    apply_word_deltas(connection, deltas)
+    db.session.commit()
+    for index, values, outcome in writes:
+        if values['name'] in returned:
+            status = 201 if outcome == 'created' else 200
+            results[index] = {'index': index, 'status': status, 'result': outcome,
+                              'id': returned[values['name']], 'name': values['name']}
+        else:
+            # A concurrent writer stored this name first and the conflict clause skipped the row
+            results[index] = {'index': index, 'status': 200, 'result': 'unchanged', 'name': values['name']}
+
+# True when an IntegrityError comes from the unique constraint on destination.name rather than,
+# say, an explicit id that is already taken. PostgreSQL names the constraint; SQLite and MySQL
+# only mention the column in the message
+def is_duplicate_name_error(error):
+    constraint = getattr(getattr(error.orig, 'diag', None), 'constraint_name', None)
+    if constraint is not None:
+        return constraint == 'destination_name_key'
+    return 'destination.name' in str(error.orig)
+
+# Insert one chunk of validated items in a single transaction, recording a result per item
+def insert_destination_chunk(items, indexes, results):
+    names = [items[index]['name'] for index in indexes]
+    # Detect conflicts with existing rows up front with one query instead of per-row failures
+    existing = {name for (name,) in db.session.query(Destination.name).filter(Destination.name.in_(names))}
+    for index in indexes:
+        if items[index]['name'] in existing:
+            results[index] = {'index': index, 'status': 400, 'error': 'Destination name must be unique.'}
+    indexes = [index for index in indexes if results[index] is None]
+    if not indexes:
+        return
+    # Items are already validated, so build instances directly rather than through load(),
+    # which would look up every item carrying an id with its own query
+    destinations = [Destination(**items[index]) for index in indexes]
+    try:
+        db.session.add_all(destinations)
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent writer won the race for a name: retry the chunk row by row in savepoints
+        db.session.rollback()
+        destinations = [Destination(**items[index]) for index in indexes]
+        for index, destination in zip(indexes, destinations):
+            try:
+                with db.session.begin_nested():
+                    db.session.add(destination)
+            except IntegrityError as e:
+                if is_duplicate_name_error(e):
+                    results[index] = {'index': index, 'status': 400, 'error': 'Destination name must be unique.'}
+                else:
+                    app.logger.warning('Inserting destination %r failed: %s', items[index].get('name'), e.orig)
+                    results[index] = {'index': index, 'status': 400, 'error': DESTINATION_WRITE_ERROR}
+        db.session.commit()
+    for index, destination in zip(indexes, destinations):
+        if results[index] is None:
+            results[index] = {'index': index, 'status': 201, 'id': destination.id, 'name': destination.name}
+
+# Pluggable JSON encoders for the read path, selected by DESTINATION_JSON_ENCODER (a name
+# below or any callable returning bytes). 'json' matches jsonify byte for byte; 'orjson' is
+# faster but writes non-ASCII characters unescaped
+def encode_json_stdlib(obj):
+    if (app.json.compact is None and app.debug) or app.json.compact is False:
+        return app.json.dumps(obj, indent=2).encode()
+    return app.json.dumps(obj, separators=(',', ':')).encode()
+
+def encode_json_orjson(obj):
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+JSON_ENCODERS = {'json': encode_json_stdlib}
+if orjson is not None:
+    JSON_ENCODERS['orjson'] = encode_json_orjson
+
+def json_encoder():
+    encoder = app.config['DESTINATION_JSON_ENCODER']
+    return encoder if callable(encoder) else JSON_ENCODERS[encoder]
+
+# Equivalent of jsonify(result), status for already-serialized rows
+def json_response(result, status):
+    started = time.perf_counter()
+    body = json_encoder()(result) + b'\n'
+    if 'serialization_time' in g:
+        g.serialization_time += time.perf_counter() - started
+    return Response(body, status=status, mimetype=app.json.mimetype)
+
+# Parse an integer query parameter, raising ValueError with a client-facing message
+def parse_int_arg(name, default=None, minimum=None, maximum=None):
+    value = request.args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer.')
+    if minimum is not None and value < minimum:
+        raise ValueError(f'{name} must be at least {minimum}.')
+    if maximum is not None and value > maximum:
+        value = maximum
+    return value
+
+def parse_bool_arg(name):
+    return request.args.get(name, '').lower() in ('1', 'true', 'yes')
+
+# Parse a required float query parameter within [minimum, maximum]
+def parse_float_arg(name, minimum, maximum, default=None):
+    value = request.args.get(name)
+    if value is None or value == '':
+        if default is None:
+            raise ValueError(f'{name} is required.')
+        return default
+    try:
+        value = float(value)
+    except ValueError:
+        raise ValueError(f'{name} must be a number.')
+    if not minimum <= value <= maximum:
+        raise ValueError(f'{name} must be between {minimum} and {maximum}.')
+    return value
+
+# Parse the sparse fieldset parameter (?fields=id,name) into schema field names, in schema order.
+# Output keys are sorted anyway, and a canonical order keeps row_serializer's cache to one entry
+# per subset of fields rather than one per ordering a client sends
+def parse_fields_arg():
+    value = request.args.get('fields')
+    if not value:
+        return None
+    requested = {field.strip() for field in value.split(',') if field.strip()}
+    unknown = requested.difference(DestinationSchema.Meta.fields)
+    if unknown or not requested:
+        raise ValueError(f"fields must be a comma-separated subset of {', '.join(DestinationSchema.Meta.fields)}.")
+    return tuple(field for field in DestinationSchema.Meta.fields if field in requested)
+
+# Compile a row-to-dict function for a fieldset. Rows always carry id first (needed for keyset
+# paging) followed by the requested columns, and the generated function emits exactly the keys
+# DestinationSchema(only=fields) would, without per-field dispatch or ORM hydration
+@functools.lru_cache(maxsize=None)
+def row_serializer(fields=None, embed_analytics=False):
+    fields = fields or DestinationSchema.Meta.fields
+    columns = ('id',) + tuple(field for field in fields if field != 'id')
+    items = ', '.join(f'{field!r}: row[{columns.index(field)}]' for field in fields)
+    columns = tuple(getattr(Destination, column) for column in columns)
+    if embed_analytics:
+        # Analytics columns follow the destination columns; a missing side row embeds null
+        first = len(columns)
+        metrics = ', '.join(f'{field!r}: row[{first + i}]' for i, field in enumerate(ANALYTICS_FIELDS))
+        items += f", 'analytics': {{{metrics}}} if row[{first}] is not None else None"
+        columns += tuple(getattr(DestinationAnalytics, field) for field in ANALYTICS_FIELDS)
+    namespace = {}
+    exec(f'def serialize(row):\n    return {{{items}}}', namespace)
+    return columns, namespace['serialize']
+
+# SELECT for serializer columns, joining the analytics side table when any of its columns are needed
+def select_destination_rows(columns):
+    statement = select(*columns)
+    if any(column.class_ is DestinationAnalytics for column in columns):
+        statement = statement.select_from(Destination).outerjoin(DestinationAnalytics)
+    return statement
+
+# Parse ?embed=analytics, the only embeddable relation on list reads
+def parse_embed_arg():
+    value = request.args.get('embed')
+    if not value:
+        return False
+    if value != 'analytics':
+        raise ValueError('embed must be analytics.')
+    return True
+
+# Build SQL filter expressions from the category, location and name-prefix query parameters
+def destination_filters():
+    filters = []
+    if request.args.get('category'):
+        filters.append(Destination.category == request.args['category'])
+    if request.args.get('location'):
+        filters.append(Destination.location == request.args['location'])
+    if request.args.get('name'):
+        # A range on name rather than LIKE so the unique index on name serves the prefix match
+        prefix = request.args['name']
+        filters.append(Destination.name >= prefix)
+        filters.append(Destination.name < prefix + '\U0010ffff')
+    return filters
+
+# Fetch one keyset page of raw destination rows ordered by id, starting after the given id
+def fetch_destination_page(after_id, limit, filters=(), columns=()):
+    statement = select_destination_rows(columns or row_serializer()[0]).where(*filters).order_by(Destination.id)
+    if after_id is not None:
+        statement = statement.where(Destination.id > after_id)
+    return db.session.execute(statement.limit(limit)).all()
+
+# Write the JSON array to the socket batch by batch so memory stays flat for any table size
+def stream_destinations(after_id, batch_size, filters=(), fields=None, embed_analytics=False):
+    columns, serialize = row_serializer(fields, embed_analytics)
+    encode = json_encoder()
+    yield b'['
+    first = True
+    while True:
+        batch = fetch_destination_page(after_id, batch_size, filters, columns)
+        for row in batch:
+            yield (b'' if first else b',') + encode(serialize(row))
+            first = False
+        if len(batch) < batch_size:
+            break
+        after_id = batch[-1][0]
+    yield b']'
+
 @app.route('/destination', methods=['GET'])
+@cached_response
 def get_destinations():
-    destination_schema = DestinationSchema(many=True)
-    destinations = Destination.query.all()
-    result = destination_schema.dump(destinations)
-    return jsonify(result), 200
+    try:
+        after_id = parse_int_arg('after_id', minimum=0)
+        limit = parse_int_arg('limit', minimum=1, maximum=app.config['DESTINATION_MAX_PAGE_SIZE'])
+        fields = parse_fields_arg()
+        embed_analytics = parse_embed_arg()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    filters = destination_filters()
+
+    # Opt-in streaming mode returns the full (remaining) list as a chunked JSON array
+    if parse_bool_arg('stream'):
+        batch_size = app.config['DESTINATION_STREAM_BATCH_SIZE']
+        return Response(stream_with_context(stream_destinations(after_id, batch_size, filters, fields, embed_analytics)),
+                        status=200, mimetype='application/json')
+
+    columns, serialize = row_serializer(fields, embed_analytics)
+    if after_id is None and limit is None:
+        rows = db.session.execute(select_destination_rows(columns).where(*filters))
+        result = [serialize(row) for row in rows]
+        return json_response(result, 200)
+
+    # Keyset pagination: fetch one extra row to know whether another page exists
+    limit = limit or app.config['DESTINATION_PAGE_SIZE']
+    rows = fetch_destination_page(after_id, limit + 1, filters, columns)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_after_id = rows[-1][0] if has_more else None
+    result = {'items': [serialize(row) for row in rows], 'next_after_id': next_after_id}
+    return json_response(result, 200)
+
+@app.route('/destination/facets', methods=['GET'])
+@cached_response
+def get_destination_facets():
+    # Counts are computed by GROUP BY in the database and respect the same filters as the list
+    filters = destination_filters()
+    result = {}
+    for field in ('category', 'location'):
+        column = getattr(Destination, field)
+        rows = (db.session.query(column, func.count(Destination.id))
+                .filter(*filters)
+                .group_by(column)
+                .order_by(func.count(Destination.id).desc(), column))
+        result[field] = [{'value': value, 'count': count} for value, count in rows]
+    return json_response(result, 200)
+
+@app.route('/destination/stats/words', methods=['GET'])
+@cached_response
+def get_word_stats():
+    try:
+        n = parse_int_arg('n', 10, minimum=1, maximum=app.config['DESTINATION_MAX_PAGE_SIZE'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    category = request.args.get('category') or None
+    # Answered from the maintained counts through the (scope, count) index, not from descriptions
+    scope = word_scopes(category)[-1]
+    rows = db.session.execute(
+        select(DestinationWordCount.word, DestinationWordCount.count)
+        .where(DestinationWordCount.scope == scope, DestinationWordCount.count > 0)
+        .order_by(DestinationWordCount.count.desc(), DestinationWordCount.word)
+        .limit(n))
+    return json_response({'category': category, 'words': [[word, count] for word, count in rows]}, 200)
+
+@app.route('/destination/nearby', methods=['GET'])
+@cached_response
+def get_nearby_destinations():
+    try:
+        lat = parse_float_arg('lat', -90, 90)
+        lon = parse_float_arg('lon', -180, 180)
+        radius_km = parse_float_arg('radius_km', 0, math.pi * EARTH_RADIUS_KM, default=10)
+        limit = parse_int_arg('limit', app.config['DESTINATION_PAGE_SIZE'], minimum=1,
+                              maximum=app.config['DESTINATION_MAX_PAGE_SIZE'])
+        fields = parse_fields_arg()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # The spatial index narrows to a bounding box; only those candidates get an exact distance
+    nearest = nearby_destination_ids(lat, lon, radius_km, limit)
+    columns, serialize = row_serializer(fields)
+    rows = {row[0]: row for row in db.session.execute(
+        select(*columns).where(Destination.id.in_([destination_id for _, destination_id in nearest])))}
+    items = [dict(serialize(rows[destination_id]), distance_km=round(distance, 3))
+             for distance, destination_id in nearest if destination_id in rows]
+    return json_response({'items': items}, 200)
 
+@app.route('/destination/search', methods=['GET'])
+@cached_response
+def search_destinations():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'q must not be empty.'}), 400
+    try:
+        limit = parse_int_arg('limit', app.config['DESTINATION_PAGE_SIZE'], minimum=1,
+                              maximum=app.config['DESTINATION_MAX_PAGE_SIZE'])
+        offset = parse_int_arg('offset', 0, minimum=0)
+        fields = parse_fields_arg()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Rank in the index, then load only the rows for this page and keep the ranked order
+    destination_ids = search_destination_ids(query, limit + 1, offset)
+    has_more = len(destination_ids) > limit
+    destination_ids = destination_ids[:limit]
+    columns, serialize = row_serializer(fields)
+    rows = {row[0]: row for row in db.session.execute(select(*columns).where(Destination.id.in_(destination_ids)))}
+    result = {
+        'items': [serialize(rows[i]) for i in destination_ids if i in rows],
+        'next_offset': offset + limit if has_more else None,
+    }
+    return json_response(result, 200)
+
+# Stream every destination as one JSON object per line, reading through a server-side cursor
+def export_destinations_ndjson(batch_size):
+    columns, serialize = row_serializer()
+    encoder = json_encoder()
+    if encoder is encode_json_stdlib:
+        # NDJSON needs one object per line even when jsonify would pretty-print
+        encoder = lambda obj: app.json.dumps(obj, separators=(',', ':')).encode()
+    statement = select(*columns).order_by(Destination.id).execution_options(yield_per=batch_size)
+    for row in db.session.execute(statement):
+        yield encoder(serialize(row)) + b'\n'
+
+@app.route('/destination/export.ndjson', methods=['GET'])
+def export_destinations():
+    batch_size = app.config['DESTINATION_STREAM_BATCH_SIZE']
+    return Response(stream_with_context(export_destinations_ndjson(batch_size)),
+                    status=200, mimetype='application/x-ndjson')
+
+@app.route('/destination/<destination_id>/analytics', methods=['GET'])
+@cached_response
+def get_destination_analytics(destination_id):
+    columns = (Destination.description,) + tuple(getattr(DestinationAnalytics, f) for f in ANALYTICS_FIELDS)
+    row = db.session.execute(select_destination_rows(columns).where(Destination.id == destination_id)).first()
+    if row is None:
+        return jsonify({'error': 'Destination not found.'}), 404
+    if row[1] is None:
+        # Not backfilled yet: compute from the description without writing on a read
+        result = describe_text(row[0])
+    else:
+        result = dict(zip(ANALYTICS_FIELDS, row[1:]))
+    return json_response(result, 200)
+
+# 200 JSON response with a strong ETag, answering If-None-Match with 304
+def conditional_json_response(result):
+    response = json_response(result, 200)
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+    return response.make_conditional(request)
+
+# Not wrapped in cached_response: the hot-object cache below is the only cache for this route, so its
+# TTL and shared backend decide how long an entry lives. ETags are still set for conditional requests
 @app.route('/destination/<destination_id>', methods=['GET'])
 def get_destination(destination_id):
-    destination_schema = DestinationSchema()
-    destination = Destination.query.get(destination_id)
-    if destination:
-        result = destination_schema.dump(destination)
-        return jsonify(result), 200
+    try:
+        fields = parse_fields_arg()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    # Full objects are served from the hot-object cache; field selections always read the row
+    object_cache = get_object_cache()
+    # ASCII digits only: str.isdigit() accepts characters such as '²' that int() rejects, and int()
+    # accepts non-ASCII decimals such as '٣' that the database would not match against the id
+    numeric = destination_id.isascii() and destination_id.isdecimal()
+    cache_key = int(destination_id) if fields is None and numeric else None
+    if cache_key is not None:
+        found, result = object_cache.get(cache_key)
+        if found:
+            if result is None:
+                return jsonify({'error': 'Destination not found.'}), 404
+            return conditional_json_response(result)
+        generation = object_cache.current_generation()
+    columns, serialize = row_serializer(fields)
+    row = db.session.execute(select(*columns).where(Destination.id == destination_id)).first()
+    result = serialize(row) if row else None
+    if cache_key is not None:
+        object_cache.set(cache_key, result, generation)
+    if result is not None:
+        return conditional_json_response(result)
     else:
         return jsonify({'error': 'Destination not found.'}), 404
 
+# Per-request performance instrumentation, exposed in Prometheus text format at /metrics
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, labels, value):
+        counts = self.series.setdefault(labels, [[0] * len(self.buckets), 0, 0])
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[0][i] += 1
+        counts[1] += 1
+        counts[2] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, (buckets, total, value_sum) in sorted(self.series.items()):
+            label_text = ','.join(f'{key}="{value}"' for key, value in labels)
+            for bound, bucket_count in zip(self.buckets, buckets):
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {bucket_count}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {total}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {value_sum}')
+            lines.append(f'{self.name}_count{{{label_text}}} {total}')
+        return lines
+
+class RequestMetrics:
+    TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250)
+    SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.histograms = (
+            Histogram('destination_request_duration_seconds', 'Request latency.', self.TIME_BUCKETS),
+            Histogram('destination_request_sql_statements', 'SQL statements executed per request.',
+                      self.COUNT_BUCKETS),
+            Histogram('destination_request_sql_seconds', 'Time spent in SQL per request.', self.TIME_BUCKETS),
+            Histogram('destination_request_serialization_seconds', 'Time spent encoding JSON per request.',
+                      self.TIME_BUCKETS),
+            Histogram('destination_response_size_bytes', 'Response body size.', self.SIZE_BUCKETS),
+        )
+
+    def record(self, endpoint, method, status, duration, sql_count, sql_time, serialization_time, size):
+        labels = (('endpoint', endpoint), ('method', method))
+        with self.lock:
+            key = labels + (('status', str(status)),)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            for histogram, value in zip(self.histograms, (duration, sql_count, sql_time, serialization_time, size)):
+                if value is not None:
+                    histogram.observe(labels, value)
+
+    def render(self):
+        with self.lock:
+            lines = ['# HELP destination_requests_total Requests handled.',
+                     '# TYPE destination_requests_total counter']
+            for labels, total in sorted(self.requests.items()):
+                label_text = ','.join(f'{key}="{value}"' for key, value in labels)
+                lines.append(f'destination_requests_total{{{label_text}}} {total}')
+            for histogram in self.histograms:
+                lines.extend(histogram.render())
+        return '\n'.join(lines) + '\n'
+
+request_metrics = RequestMetrics()
+
+# Count and time every SQL statement, attributing it to the request being handled, if any. The start
+# time lives on the execution context, so a statement that raises leaves nothing behind on the connection
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_sql_timer(conn, cursor, statement, parameters, context, executemany):
+    context.query_started = time.perf_counter()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def stop_sql_timer(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.query_started
+    if has_app_context() and 'sql_count' in g:
+        g.sql_count += 1
+        g.sql_time += elapsed
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.sql_count = 0
+    g.sql_time = 0
+    g.serialization_time = 0
+
+@app.after_request
+def record_request_metrics(response):
+    if 'request_started' not in g:
+        return response
+    duration = time.perf_counter() - g.request_started
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    request_metrics.record(endpoint, request.method, response.status_code, duration,
+                           g.sql_count, g.sql_time, g.serialization_time, response.content_length)
+    if duration * 1000 > app.config['SLOW_REQUEST_THRESHOLD_MS']:
+        app.logger.warning('Slow request %s %s: %.1f ms total, %d SQL statements in %.1f ms, '
+                           '%.1f ms serialization, %s bytes', request.method, request.full_path,
+                           duration * 1000, g.sql_count, g.sql_time * 1000, g.serialization_time * 1000,
+                           response.content_length)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(request_metrics.render() + get_object_cache().render(), status=200, mimetype='text/plain; version=0.0.4')
+
+# Command line tools for the destination catalogue: flask destinations <command>
+destinations_cli = AppGroup('destinations', help='Manage the destination catalogue.')
+app.cli.add_command(destinations_cli)
+
+@destinations_cli.command('check-serializer')
+@click.option('--limit', default=1000, show_default=True, help='Number of rows to compare.')
+@click.option('--fields', default=None, help='Comma-separated fieldset to compare (default: all).')
+def check_serializer_command(limit, fields):
+    """Check the fast read path against DestinationSchema.dump + jsonify, byte for byte."""
+    fields = tuple(fields.split(',')) if fields else None
+    destinations = Destination.query.order_by(Destination.id).limit(limit).all()
+    expected = jsonify(DestinationSchema(many=True, only=fields).dump(destinations)).get_data()
+    columns, serialize = row_serializer(fields)
+    rows = fetch_destination_page(None, limit, columns=columns)
+    actual = json_response([serialize(row) for row in rows], 200).get_data()
+    if actual != expected:
+        raise click.ClickException(f'Fast serializer output differs from the schema dump '
+                                   f'({len(actual)} vs {len(expected)} bytes).')
+    click.echo(f'Fast serializer output matches the schema dump for {len(rows)} rows.')
+
+@destinations_cli.command('export')
+@click.option('--output', '-o', type=click.File('wb'), default='-', help='File to write (default: stdout).')
+def export_command(output):
+    """Export all destinations as NDJSON, one destination per line."""
+    for line in export_destinations_ndjson(app.config['DESTINATION_STREAM_BATCH_SIZE']):
+        output.write(line)
+
+@destinations_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', default=1000, show_default=True, help='Lines committed per transaction.')
+@click.option('--restart', is_flag=True, help='Ignore any checkpoint left by a failed run.')
+@click.option('--keep-ids', is_flag=True, help='Insert rows with the ids from the file instead of new ones.')
+def import_command(path, chunk_size, restart, keep_ids):
+    """Import destinations from an NDJSON file in chunked transactions.
+
+    Progress is checkpointed to PATH.progress after every committed chunk, so a
+    failed run resumes where it stopped. Names that already exist are skipped.
+    Exported ids are dropped unless --keep-ids is given, since the target
+    database may already use them for other destinations.
+    """
+    checkpoint = path + '.progress'
+    done = 0
+    if os.path.exists(checkpoint) and not restart:
+        with open(checkpoint) as f:
+            done = int(f.read().strip() or 0)
+        click.echo(f'Resuming after line {done}.', err=True)
+    totals = {'created': 0, 'skipped': 0, 'failed': 0}
+
+    def flush(items, line_numbers):
+        for line_number, result in zip(line_numbers, create_destinations(items)):
+            if result['status'] == 201:
+                totals['created'] += 1
+            elif result['error'] == 'Destination name must be unique.':
+                totals['skipped'] += 1
+            else:
+                totals['failed'] += 1
+                click.echo(f'Line {line_number}: {result["error"]}', err=True)
+
+    with open(path, encoding='utf-8') as f:
+        items, line_numbers = [], []
+        for line_number, line in enumerate(f, start=1):
+            if line_number <= done or not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                totals['failed'] += 1
+                click.echo(f'Line {line_number}: invalid JSON ({e})', err=True)
+            else:
+                # Exported rows carry explicit nulls for empty optional columns, which the schema rejects
+                if isinstance(item, dict):
+                    item = {key: value for key, value in item.items()
+                            if value is not None and (keep_ids or key != 'id')}
+                items.append(item)
+                line_numbers.append(line_number)
+            if len(items) >= chunk_size:
+                flush(items, line_numbers)
+                items, line_numbers = [], []
+                with open(checkpoint, 'w') as progress:
+                    progress.write(str(line_number))
+                click.echo(f'Line {line_number}: {totals["created"]} created, {totals["skipped"]} skipped, '
+                           f'{totals["failed"]} failed.', err=True)
+        if items:
+            flush(items, line_numbers)
+
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    click.echo(f'Import finished: {totals["created"]} created, {totals["skipped"]} skipped, '
+               f'{totals["failed"]} failed.')
+
+@destinations_cli.command('backfill-analytics')
+@click.option('--chunk-size', default=1000, show_default=True, help='Destinations processed per transaction.')
+@click.option('--all', 'recompute', is_flag=True, help='Recompute analytics that already exist.')
+def backfill_analytics_command(chunk_size, recompute):
+    """Compute description analytics for existing destinations in chunks."""
+    after_id = 0
+    processed = 0
+    while True:
+        statement = (select(Destination.id, Destination.description)
+                     .select_from(Destination).outerjoin(DestinationAnalytics)
+                     .where(Destination.id > after_id).order_by(Destination.id).limit(chunk_size))
+        if not recompute:
+            statement = statement.where(DestinationAnalytics.destination_id.is_(None))
+        rows = db.session.execute(statement).all()
+        if not rows:
+            break
+        save_destination_analytics(rows)
+        db.session.commit()
+        processed += len(rows)
+        after_id = rows[-1][0]
+        click.echo(f'{processed} destinations processed (last id {after_id}).', err=True)
+    click.echo(f'Backfill finished: {processed} destinations processed.')
+
+@destinations_cli.command('rebuild-word-stats')
+@click.option('--chunk-size', default=1000, show_default=True, help='Destinations read per query.')
+def rebuild_word_stats_command(chunk_size):
+    """Recount catalogue-wide word frequencies from every description."""
+    deltas = Counter()
+    after_id = 0
+    while True:
+        rows = db.session.execute(select(Destination.id, Destination.description, Destination.category)
+                                  .where(Destination.id > after_id).order_by(Destination.id)
+                                  .limit(chunk_size)).all()
+        if not rows:
+            break
+        for _, description, category in rows:
+            add_word_deltas(deltas, description, category, 1)
+        after_id = rows[-1][0]
+    db.session.execute(DestinationWordCount.__table__.delete())
+    items = list(deltas.items())
+    for start in range(0, len(items), chunk_size):
+        apply_word_deltas(db.session.connection(), dict(items[start:start + chunk_size]))
+    db.session.commit()
+    click.echo(f'Word statistics rebuilt: {len(deltas)} scoped words.')
+
 if __name__ == '__main__':
     app.run(debug=True)